@@ -150,6 +150,17 @@ class CalendarAdmin(admin.ModelAdmin):
 
     webhook_info_display.short_description = "Webhook Details"
 
+    def delete_queryset(self, request, queryset):
+        # Bulk deletes skip Calendar.delete() - reset the affected accounts'
+        # calendar list sync tokens so the next refresh lists everything
+        account_ids = list(
+            queryset.values_list("calendar_account_id", flat=True).distinct()
+        )
+        super().delete_queryset(request, queryset)
+        CalendarAccount.objects.filter(pk__in=account_ids).update(
+            calendar_list_sync_token=""
+        )
+
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
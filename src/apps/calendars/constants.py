@@ -21,6 +21,7 @@ class SyncConstants:
     API_CALLS_PER_MINUTE = 50
     API_RETRY_ATTEMPTS = 3
     EXPONENTIAL_BACKOFF_BASE = 2
+    API_BATCH_MAX_REQUESTS = 50  # Google's limit for one HTTP batch call
 
 
 class OAuth:
@@ -34,6 +35,22 @@ class OAuth:
     TOKEN_REFRESH_BUFFER_MINUTES = 10
 
 
+class WebhookConstants:
+    """Webhook endpoint configuration"""
+
+    # Full path of the Google endpoint as mounted in calendar_sync/urls.py - used
+    # to build the channel address Google calls back (no reverse() needed)
+    GOOGLE_PATH = "/webhooks/google/"
+
+    # Channel ids are this prefix plus 8 hex characters
+    CHANNEL_ID_PREFIX = "calendar-sync-"
+
+    @staticmethod
+    def channel_cache_key(channel_id: str) -> str:
+        """Cache key for the channel -> calendar pk the webhook view resolves"""
+        return f"webhook_channel_calendar_{channel_id}"
+
+
 class TokenConstants:
     """Token management configuration"""
 
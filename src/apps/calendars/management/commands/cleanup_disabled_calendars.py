@@ -112,19 +112,11 @@ class Command(BaseCommand):
         busy_blocks = calendar.event_states.filter(is_busy_block=True).count()
 
         # Count outbound busy blocks that would be deleted
-        if user_events > 0:
-            user_event_uuids = list(
-                calendar.event_states.filter(is_busy_block=False)
-                .values_list('uuid', flat=True)
-            )
-
-            from apps.calendars.models import EventState
-            outbound_busy_blocks = EventState.objects.filter(
-                source_uuid__in=user_event_uuids,
-                is_busy_block=True
-            ).exclude(calendar=calendar).count()
-        else:
-            outbound_busy_blocks = 0
+        from apps.calendars.models import EventState
+        outbound_busy_blocks = EventState.objects.filter(
+            origin_calendar=calendar,
+            is_busy_block=True
+        ).exclude(calendar=calendar).count()
 
         self.stdout.write(
             f"  📅 {calendar.name} ({calendar.calendar_account.email}):"
@@ -176,11 +168,11 @@ class Command(BaseCommand):
         finally:
             # CRITICAL: Always clear the cleanup_pending flag (Guilfoyle's requirement)
             try:
-                calendar.refresh_from_db()
-                calendar.cleanup_pending = False
+                # One UPDATE of just the flags - no re-read of the calendar row
+                cleared = {'cleanup_pending': False}
                 if cleanup_completed:
-                    calendar.cleanup_requested_at = None
-                calendar.save(update_fields=['cleanup_pending', 'cleanup_requested_at'])
+                    cleared['cleanup_requested_at'] = None
+                Calendar.objects.filter(pk=calendar.pk).update(**cleared)
 
                 self.logger.info(f"Cleared cleanup_pending flag for {calendar.name}")
             except Exception as e:
@@ -349,6 +349,7 @@ class Command(BaseCommand):
             target_calendar=target_calendar,
             source_uuid=source_event.uuid,
             title=source_event.title or "Event",
+            origin_calendar_id=source_event.calendar_id,
         )
 
         # Create in Google Calendar with UUID correlation
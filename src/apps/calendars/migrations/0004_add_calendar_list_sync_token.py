@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendars', '0003_optimize_cleanup_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendaraccount',
+            name='calendar_list_sync_token',
+            field=models.TextField(blank=True, default='', help_text='Google calendarList sync token for incremental calendar refresh'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 10:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_origin_calendar(apps, schema_editor):
+    """Set origin_calendar on existing busy blocks from their source events"""
+    EventState = apps.get_model('calendars', 'EventState')
+    # One UPDATE with a correlated subquery - blocks whose source is gone stay NULL
+    EventState.objects.filter(is_busy_block=True).update(
+        origin_calendar_id=models.Subquery(
+            EventState.objects.filter(uuid=models.OuterRef('source_uuid')).values(
+                'calendar_id'
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendars', '0004_add_calendar_list_sync_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventstate',
+            name='origin_calendar',
+            field=models.ForeignKey(blank=True, help_text='Calendar of the source event (for busy blocks only)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='calendars.calendar'),
+        ),
+        migrations.RunPython(backfill_origin_calendar, migrations.RunPython.noop),
+    ]
@@ -3,12 +3,13 @@ import logging
 import uuid
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator
 from django.db import models
 from django.utils import timezone
 
-from .constants import BusyBlock, SyncConstants
+from .constants import BusyBlock, SyncConstants, WebhookConstants
 
 
 logger = logging.getLogger(__name__)
@@ -116,6 +117,11 @@ class CalendarAccount(models.Model):
     is_active = models.BooleanField(
         default=True, help_text="Enable/disable sync for this account"
     )
+    calendar_list_sync_token = models.TextField(
+        blank=True,
+        default="",
+        help_text="Google calendarList sync token for incremental calendar refresh",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -360,6 +366,17 @@ class Calendar(models.Model):
             self.name = self.name.strip()
         super().save(*args, **kwargs)
 
+    def delete(self, *args, **kwargs):
+        """Delete, making the account's next calendar list refresh a full one"""
+        # An incremental refresh only returns calendars changed on Google, so the
+        # row would otherwise never be recreated
+        account_id = self.calendar_account_id
+        result = super().delete(*args, **kwargs)
+        CalendarAccount.objects.filter(pk=account_id).update(
+            calendar_list_sync_token=""
+        )
+        return result
+
     def clean(self):
         """Validate calendar data"""
         if self.name and not self.name.strip():
@@ -476,6 +493,9 @@ class Calendar(models.Model):
                 "webhook_last_setup",
             ]
         )
+        # Google may notify (state "sync") before the channel id is saved; drop
+        # the unknown-channel entry that notification cached
+        cache.delete(WebhookConstants.channel_cache_key(channel_id))
 
     def clear_webhook_info(self):
         """Clear webhook information when webhook is deactivated"""
@@ -860,6 +880,17 @@ class EventState(models.Model):
         help_text="UUID of source event (for busy blocks only)"
     )
 
+    # Calendar of the source event, so a calendar's outbound busy blocks are one
+    # indexed lookup rather than a join through its user events' UUIDs
+    origin_calendar = models.ForeignKey(
+        Calendar,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Calendar of the source event (for busy blocks only)"
+    )
+
     # Event metadata for debugging and display
     title = models.CharField(
         max_length=500,
@@ -973,13 +1004,21 @@ class EventState(models.Model):
         )
 
     @classmethod
-    def create_busy_block(cls, target_calendar, source_uuid, title=""):
+    def create_busy_block(cls, target_calendar, source_uuid, title="", origin_calendar_id=None):
         """Create EventState for a busy block (pending sync)"""
+        if origin_calendar_id is None:
+            # Callers holding the source event pass its calendar_id and skip this
+            origin_calendar_id = (
+                cls.objects.filter(uuid=source_uuid)
+                .values_list('calendar_id', flat=True)
+                .first()
+            )
         return cls.objects.create(
             calendar=target_calendar,
             status='PENDING',
             is_busy_block=True,
             source_uuid=source_uuid,
+            origin_calendar_id=origin_calendar_id,
             title=f"Busy - {title}",
         )
 
@@ -1,5 +1,7 @@
 """Calendar business logic service"""
 
+from collections import defaultdict
+
 from django.db import models, transaction
 
 from ..models import Calendar, CalendarAccount
@@ -79,10 +81,15 @@ class CalendarService(BaseService):
 
     def toggle_calendar_sync(self, calendar_id):
         """Toggle sync status for a calendar (wrapper for backward compatibility)"""
-        calendar = Calendar.objects.select_related("calendar_account").get(
-            id=calendar_id
-        )
-        return self.set_calendar_sync_status(calendar_id, not calendar.sync_enabled)
+        # Only the current flag is needed - set_calendar_sync_status loads (and
+        # locks) the calendar with its account itself
+        try:
+            sync_enabled = Calendar.objects.values_list("sync_enabled", flat=True).get(
+                id=calendar_id
+            )
+        except Calendar.DoesNotExist:
+            raise ResourceNotFoundError(f"Calendar {calendar_id} not found") from None
+        return self.set_calendar_sync_status(calendar_id, not sync_enabled)
 
     def bulk_toggle_calendars(self, calendar_ids, enable=True):
         """Toggle multiple calendars efficiently"""
@@ -235,15 +242,25 @@ class CalendarService(BaseService):
             client = GoogleCalendarClient(account)
 
             try:
-                calendars_data = client.list_calendars()
+                # Incremental: only calendars changed since the last refresh
+                calendars_data, next_sync_token, full_list = (
+                    client.list_calendars_changes(
+                        account.calendar_list_sync_token or None
+                    )
+                )
             except Exception as e:
                 raise ExternalServiceError(f"Failed to fetch calendars: {e!s}")
 
             with transaction.atomic():
                 calendars_created = 0
                 calendars_updated = 0
+                deleted_calendar_ids = []
 
                 for cal_item in calendars_data:
+                    if cal_item.get("deleted"):
+                        deleted_calendar_ids.append(cal_item["id"])
+                        continue
+
                     calendar, created = Calendar.objects.update_or_create(
                         calendar_account=account,
                         google_calendar_id=cal_item["id"],
@@ -262,19 +279,49 @@ class CalendarService(BaseService):
                     else:
                         calendars_updated += 1
 
-                self._log_operation(
-                    "calendar_refresh",
-                    account_id=account.id,
-                    calendars_found=len(calendars_data),
-                    calendars_created=calendars_created,
-                    calendars_updated=calendars_updated,
-                )
+                # A full list (first refresh or expired token) never marks
+                # deletions - calendars missing from it are gone from Google
+                if full_list:
+                    deleted_calendar_ids.extend(
+                        account.calendars.exclude(
+                            google_calendar_id__in=[
+                                cal_item["id"] for cal_item in calendars_data
+                            ]
+                        ).values_list("google_calendar_id", flat=True)
+                    )
 
-                return {
-                    "calendars_found": len(calendars_data),
+                # Calendars removed from the Google list stop syncing and get
+                # their busy blocks cleaned up like a manual disable
+                calendars_disabled = 0
+                if deleted_calendar_ids:
+                    from django.utils import timezone
+
+                    calendars_disabled = Calendar.objects.filter(
+                        calendar_account=account,
+                        google_calendar_id__in=deleted_calendar_ids,
+                        sync_enabled=True,
+                    ).update(
+                        sync_enabled=False,
+                        cleanup_pending=True,
+                        cleanup_requested_at=timezone.now(),
+                    )
+
+                if next_sync_token:
+                    account.calendar_list_sync_token = next_sync_token
+                    account.save(update_fields=["calendar_list_sync_token"])
+
+                result = {
+                    "calendars_found": account.calendars.count(),
+                    "calendars_changed": len(calendars_data),
                     "calendars_created": calendars_created,
                     "calendars_updated": calendars_updated,
+                    "calendars_disabled": calendars_disabled,
                 }
+                self._log_operation(
+                    "calendar_refresh", account_id=account.id, **result
+                )
+
+                return result
 
         except CalendarAccount.DoesNotExist:
             raise ResourceNotFoundError(f"Account {account_id} not found")
@@ -464,6 +511,7 @@ class CalendarService(BaseService):
             target_calendar=target_calendar,
             source_uuid=source_event.uuid,
             title=source_event.title or "Event",
+            origin_calendar_id=source_event.calendar_id,
         )
 
         # Create in Google Calendar
@@ -549,20 +597,14 @@ class CalendarService(BaseService):
         local_user_events = calendar.event_states.filter(is_busy_block=False).count()
         local_busy_blocks = calendar.event_states.filter(is_busy_block=True).count()
 
-        # Count outbound busy blocks that will be deleted
-        user_event_uuids = list(
-            calendar.event_states.filter(is_busy_block=False).values_list('uuid', flat=True)
-        )
-
+        # Count outbound busy blocks that will be deleted - one COUNT on the
+        # indexed origin_calendar column across all other calendars
         other_calendars = self._get_other_sync_calendars(calendar)
-        outbound_busy_blocks = 0
-
-        for other_cal in other_calendars:
-            outbound_busy_blocks += EventState.objects.filter(
-                calendar=other_cal,
-                is_busy_block=True,
-                source_uuid__in=user_event_uuids
-            ).count()
+        outbound_busy_blocks = EventState.objects.filter(
+            origin_calendar=calendar,
+            calendar__in=other_calendars,
+            is_busy_block=True,
+        ).count()
 
         return {
             "local_user_events": local_user_events,
@@ -575,149 +617,113 @@ class CalendarService(BaseService):
         """Remove busy blocks created by this calendar in other calendars (Guilfoyle's batched pattern)"""
         from django.conf import settings
 
+        from apps.calendars.models import EventState
 
-        # Get UUIDs of this calendar's user events
-        user_event_uuids = list(
-            calendar.event_states.filter(is_busy_block=False).values_list('uuid', flat=True)
-        )
-
-        if not user_event_uuids:
+        other_calendars = {
+            other.id: other for other in self._get_other_sync_calendars(calendar)
+        }
+        if not other_calendars:
             return 0
 
-        other_calendars = self._get_other_sync_calendars(calendar)
+        # Busy blocks carry their source event's calendar, so finding them is one
+        # indexed lookup instead of a join through this calendar's user events.
+        # Everything the cleanup needs is read here, once - batches never re-query
+        busy_blocks = list(
+            EventState.objects.filter(
+                origin_calendar=calendar,
+                calendar_id__in=other_calendars,
+                is_busy_block=True,
+            ).values_list('uuid', 'calendar_id', 'google_event_id')
+        )
+
         total_cleaned = 0
         batch_size = getattr(settings, 'CLEANUP_BATCH_SIZE', 100)
 
-        for other_calendar in other_calendars:
+        # Batch by busy block - short transactions, and each IN clause stays far
+        # below SQLite's bound-parameter limit however many blocks there are
+        for start in range(0, len(busy_blocks), batch_size):
+            batch = busy_blocks[start:start + batch_size]
             try:
-                # Process in batches to avoid long-running transactions
-                calendar_cleaned = self._cleanup_calendar_busy_blocks_batched(
-                    other_calendar, user_event_uuids, batch_size
-                )
-                total_cleaned += calendar_cleaned
-
-                self.logger.debug(
-                    f"Cleaned {calendar_cleaned} busy blocks from {other_calendar.name}"
-                )
-
+                total_cleaned += self._cleanup_busy_blocks_batch(other_calendars, batch)
             except Exception as e:
                 self.logger.error(
-                    f"Failed to clean busy blocks from {other_calendar.name}: {e}"
+                    f"Failed to clean busy blocks for {calendar.name} events: {e}"
                 )
 
         return total_cleaned
 
-    def _cleanup_calendar_busy_blocks_batched(self, target_calendar, source_uuids, batch_size):
-        """Clean up busy blocks in batches to avoid long transactions"""
+    def _cleanup_busy_blocks_batch(self, target_calendars, busy_blocks):
+        """Delete one batch of (uuid, calendar_id, google_event_id) busy blocks"""
         from apps.calendars.models import EventState
 
-        total_deleted = 0
-
-        while True:
-            with transaction.atomic():
-                # Get batch of busy block UUIDs to delete
-                block_uuids = list(
-                    EventState.objects
-                    .filter(
-                        calendar=target_calendar,
-                        is_busy_block=True,
-                        source_uuid__in=source_uuids
-                    )
-                    .values_list('uuid', flat=True)[:batch_size]
+        # The batch may span several target calendars
+        event_ids_by_calendar = defaultdict(list)
+        for _, calendar_id, google_event_id in busy_blocks:
+            if google_event_id:
+                event_ids_by_calendar[calendar_id].append(google_event_id)
+
+        # Delete from Google Calendar first (best effort, per target calendar)
+        for calendar_id, event_ids in event_ids_by_calendar.items():
+            target_calendar = target_calendars[calendar_id]
+            deleted = self._cleanup_google_busy_blocks(event_ids, target_calendar)
+            self.logger.debug(
+                f"Cleaned {len(deleted)} busy blocks from {target_calendar.name}"
+            )
+            if len(deleted) < len(event_ids):
+                # Don't fail database cleanup if Google API fails
+                self.logger.warning(
+                    f"Google delete failed for {len(event_ids) - len(deleted)} busy "
+                    f"blocks in {target_calendar.name} (continuing with DB cleanup)"
                 )
 
-                if not block_uuids:
-                    break
-
-                # Get the blocks for Google Calendar deletion
-                blocks_to_delete = EventState.objects.filter(uuid__in=block_uuids)
-
-                # Delete from Google Calendar first (best effort)
-                try:
-                    google_cleaned = self._cleanup_google_busy_blocks(
-                        blocks_to_delete, target_calendar
-                    )
-                except Exception as e:
-                    # Don't fail database cleanup if Google API fails
-                    self.logger.warning(
-                        f"Google Calendar cleanup failed (continuing with DB cleanup): {e}"
-                    )
-                    google_cleaned = 0
-
-                # Delete from database
-                deleted_count = blocks_to_delete.delete()[0]
-                total_deleted += deleted_count
-
-                # If we deleted less than batch_size, we're done
-                if deleted_count < batch_size:
-                    break
-
-        return total_deleted
+        # Delete from database - a single DELETE by primary key for the whole batch
+        return EventState.objects.filter(
+            uuid__in=[busy_block_uuid for busy_block_uuid, _, _ in busy_blocks]
+        ).delete()[0]
 
     def _cleanup_calendar_events(self, calendar):
         """Remove all EventState records for this calendar"""
-        total_events = calendar.event_states.count()
+        try:
+            # Nothing references EventState, so this is one DELETE that also
+            # reports how many rows went
+            total_events = calendar.event_states.all().delete()[0]
+        except Exception as e:
+            self.logger.error(f"Failed to delete EventState records from {calendar.name}: {e}")
+            raise
 
         if total_events > 0:
-            try:
-                calendar.event_states.all().delete()
-                self.logger.debug(f"Deleted {total_events} EventState records from {calendar.name}")
-            except Exception as e:
-                self.logger.error(f"Failed to delete EventState records from {calendar.name}: {e}")
-                raise
+            self.logger.debug(f"Deleted {total_events} EventState records from {calendar.name}")
 
         return total_events
 
-    def _cleanup_google_busy_blocks(self, busy_blocks_queryset, target_calendar):
-        """Delete busy blocks from Google Calendar (Guilfoyle's specific error handling)"""
-        from googleapiclient.errors import HttpError
-
+    def _cleanup_google_busy_blocks(self, event_ids, target_calendar):
+        """Delete busy blocks from Google in batched calls, returning the ids now gone"""
         from apps.calendars.services.google_calendar_client import GoogleCalendarClient
 
+        if not event_ids:
+            return set()
+
         try:
             client = GoogleCalendarClient(target_calendar.calendar_account)
-            cleaned_count = 0
-
-            for busy_block in busy_blocks_queryset:
-                if busy_block.google_event_id:
-                    try:
-                        success = client.delete_event(
-                            target_calendar.google_calendar_id,
-                            busy_block.google_event_id
-                        )
-                        if success:
-                            cleaned_count += 1
-                        else:
-                            self.logger.warning(
-                                f"Failed to delete busy block from Google: {busy_block.google_event_id}"
-                            )
-                    except HttpError as e:
-                        # Google API specific errors - these are expected and shouldn't stop cleanup
-                        if e.resp.status == 404:
-                            # Event already deleted - count as success
-                            cleaned_count += 1
-                            self.logger.debug(f"Google event already deleted: {busy_block.google_event_id}")
-                        elif e.resp.status == 403:
-                            # Permission denied - log but continue
-                            self.logger.warning(f"Permission denied deleting Google event: {busy_block.google_event_id}")
-                        else:
-                            self.logger.warning(f"Google API error deleting event {busy_block.google_event_id}: {e}")
-                    except Exception as e:
-                        # Unexpected errors
-                        self.logger.warning(f"Unexpected error deleting Google event {busy_block.google_event_id}: {e}")
-
-            return cleaned_count
+
+            # Per-event failures (permission denied etc.) come back as False and are
+            # logged by the client; already-deleted events count as cleaned
+            results = client.batch_delete_events(
+                target_calendar.google_calendar_id, event_ids
+            )
+            return {event_id for event_id, success in results.items() if success}
 
         except Exception as e:
-            # Client initialization failed - this should not stop database cleanup
-            self.logger.error(f"Failed to initialize Google client for cleanup: {e}")
-            return 0
+            # Client or batch failure - this should not stop database cleanup
+            self.logger.error(f"Failed to delete busy blocks from Google for cleanup: {e}")
+            return set()
 
     def _get_other_sync_calendars(self, calendar):
         """Get other sync-enabled calendars for the same user"""
         return list(
             Calendar.objects.filter(
-                calendar_account__user=calendar.calendar_account.user,
+                # Compare on the FK column - no query to load the User itself
+                calendar_account__user_id=calendar.calendar_account.user_id,
                 sync_enabled=True,
                 calendar_account__is_active=True,
             )
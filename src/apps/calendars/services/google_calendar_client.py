@@ -10,6 +10,7 @@ from django.utils import timezone
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from apps.calendars.constants import SyncConstants, WebhookConstants
 from apps.calendars.models import CalendarAccount
 from apps.calendars.services.token_manager import TokenManager
 
@@ -17,6 +18,24 @@ from apps.calendars.services.token_manager import TokenManager
 logger = logging.getLogger(__name__)
 
 
+def _webhook_address():
+    """Absolute URL Google posts channel notifications to"""
+    return f"{settings.WEBHOOK_BASE_URL}{WebhookConstants.GOOGLE_PATH}"
+
+
+# 403 reasons Google uses for rate limits and quotas
+RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded", b"quotaExceeded")
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Check for Google's 403 rate limit / quota errors on the raw response body"""
+    return (
+        isinstance(error, HttpError)
+        and error.resp.status == 403
+        and any(reason in error.content for reason in RATE_LIMIT_REASONS)
+    )
+
+
 class GoogleCalendarClient:
     """Simple Google Calendar API client - no enterprise complexity"""
 
@@ -48,9 +67,7 @@ class GoogleCalendarClient:
             try:
                 return request.execute()
             except HttpError as e:
-                if e.resp.status == 403 and (
-                    "rateLimitExceeded" in str(e) or "quotaExceeded" in str(e)
-                ):
+                if is_rate_limit_error(e):
                     if attempt < max_retries:
                         delay = base_delay * (2**attempt)  # Exponential backoff
                         logger.warning(
@@ -73,6 +90,61 @@ class GoogleCalendarClient:
         # This should never be reached
         raise Exception(f"Max retries exceeded for {operation_name}")
 
+    def _execute_batch(
+        self, keyed_requests, operation_name: str, max_retries: int = 3
+    ) -> dict:
+        """
+        Execute requests through Google's HTTP batch endpoint.
+
+        Sends up to API_BATCH_MAX_REQUESTS requests per HTTP round-trip instead
+        of one round-trip per request. Google rate limits individual requests
+        inside a batch, so requests answered with a rate limit error are sent
+        again in a new batch with the same exponential backoff as single calls.
+
+        Args:
+            keyed_requests: Iterable of (key, request) pairs, keys must be unique strings
+
+        Returns:
+            Dict mapping each key to its response, or to the HttpError raised
+            for that individual request (after retries, for rate limit errors)
+        """
+        service = self._get_service()
+        results = {}
+
+        def _collect(request_id, response, exception):
+            results[request_id] = exception if exception is not None else response
+
+        requests = dict(keyed_requests)
+        pending = list(requests)
+        batch_size = SyncConstants.API_BATCH_MAX_REQUESTS
+        base_delay = 3  # Same backoff as _execute_with_rate_limiting
+
+        for attempt in range(max_retries + 1):
+            for start in range(0, len(pending), batch_size):
+                batch = service.new_batch_http_request(callback=_collect)
+                for key in pending[start : start + batch_size]:
+                    batch.add(requests[key], request_id=key)
+                self._execute_with_rate_limiting(batch, operation_name)
+
+            pending = [key for key in pending if is_rate_limit_error(results.get(key))]
+            if not pending:
+                break
+            if attempt == max_retries:
+                logger.error(
+                    f"Rate limit exceeded after {max_retries} retries for "
+                    f"{len(pending)} requests in {operation_name}"
+                )
+                break
+
+            delay = base_delay * (2**attempt)  # Exponential backoff
+            logger.warning(
+                f"Rate limit hit for {len(pending)} requests in {operation_name}, "
+                f"retrying in {delay}s (attempt {attempt + 1}/{max_retries + 1})"
+            )
+            time.sleep(delay)
+
+        return results
+
     def list_calendars(self) -> list[dict]:
         """List all calendars for the account"""
         try:
@@ -92,6 +164,51 @@ class GoogleCalendarClient:
             )
             raise
 
+    def list_calendars_changes(
+        self, sync_token: str | None = None
+    ) -> tuple[list[dict], str | None, bool]:
+        """
+        List calendars changed since sync_token (all calendars if no token)
+
+        Returns:
+            (items, next_sync_token, full_list) - items may include entries
+            marked "deleted". An expired token (410 Gone) falls back to a full
+            list; full_list tells the caller that calendars missing from items
+            were deleted, since a full list never marks them.
+        """
+        try:
+            service = self._get_service()
+            items = []
+            page_token = None
+
+            while True:
+                params = {"pageToken": page_token} if page_token else {}
+                if sync_token:
+                    params["syncToken"] = sync_token
+                request = service.calendarList().list(**params)
+                calendar_list = self._execute_with_rate_limiting(
+                    request, f"list_calendars_changes for {self.account.email}"
+                )
+                items.extend(calendar_list.get("items", []))
+
+                page_token = calendar_list.get("nextPageToken")
+                if not page_token:
+                    return items, calendar_list.get("nextSyncToken"), not sync_token
+
+        except HttpError as e:
+            if sync_token and e.resp.status == 410:
+                logger.info(
+                    f"Calendar list sync token expired for {self.account.email}, doing full list"
+                )
+                return self.list_calendars_changes()
+            logger.error(f"Failed to list calendars for {self.account.email}: {e}")
+            raise
+        except Exception as e:
+            logger.error(
+                f"Unexpected error listing calendars for {self.account.email}: {e}"
+            )
+            raise
+
     def get_calendar(self, calendar_id: str) -> dict | None:
         """Get details for a specific calendar"""
         try:
@@ -313,23 +430,36 @@ class GoogleCalendarClient:
     def batch_delete_events(
         self, calendar_id: str, event_ids: list[str]
     ) -> dict[str, bool]:
-        """Delete multiple events with rate limiting between calls"""
+        """Delete multiple events through batched API calls"""
+        service = self._get_service()
+
+        # Batch request IDs must be unique, so each event is deleted once
+        responses = self._execute_batch(
+            (
+                (
+                    event_id,
+                    service.events().delete(calendarId=calendar_id, eventId=event_id),
+                )
+                for event_id in dict.fromkeys(event_ids)
+            ),
+            f"batch_delete_events in {calendar_id}",
+        )
 
         results = {}
-
-        for i, event_id in enumerate(event_ids):
-            try:
-                success = self.delete_event(calendar_id, event_id)
-                results[event_id] = success
-
-                # Add delay between deletions to avoid rate limiting (except for last item)
-                if i < len(event_ids) - 1:
-                    time.sleep(1.0)  # 1 second delay between deletions
-
-            except Exception as e:
-                logger.error(f"Failed to delete event {event_id}: {e}")
+        for event_id, response in responses.items():
+            if not isinstance(response, Exception):
+                results[event_id] = True
+            elif isinstance(response, HttpError) and response.resp.status in (404, 410):
+                # Missing or already-deleted events count as successfully deleted
+                logger.info(f"Event {event_id} already deleted from {calendar_id}")
+                results[event_id] = True
+            else:
+                logger.error(f"Failed to delete event {event_id}: {response}")
                 results[event_id] = False
 
+        logger.info(
+            f"Deleted {sum(results.values())}/{len(results)} events from calendar {calendar_id}"
+        )
         return results
 
     def setup_webhook(
@@ -362,7 +492,7 @@ class GoogleCalendarClient:
                 )
                 return {
                     "channel_id": calendar.webhook_channel_id,
-                    "webhook_url": f"{settings.WEBHOOK_BASE_URL}/webhooks/google/",
+                    "webhook_url": _webhook_address(),
                     "expires_at": calendar.webhook_expires_at,
                     "skipped": True,
                 }
@@ -375,25 +505,8 @@ class GoogleCalendarClient:
                     calendar.webhook_channel_id, calendar.google_calendar_id
                 )
 
-            # Generate unique channel ID
-            channel_id = f"calendar-sync-{uuid.uuid4().hex[:8]}"
-
-            # Build webhook URL
-            webhook_url = f"{settings.WEBHOOK_BASE_URL}/webhooks/google/"
-
-            # Set expiration (Google allows max 7 days for calendar events)
-            expiration_time = timezone.now() + timedelta(days=6)  # 6 days for safety
-            expiration_timestamp = int(
-                expiration_time.timestamp() * 1000
-            )  # Milliseconds
-
-            # Create webhook subscription
-            watch_request = {
-                "id": channel_id,
-                "type": "web_hook",
-                "address": webhook_url,
-                "expiration": expiration_timestamp,
-            }
+            channel_id, expiration_time, watch_request = self._build_watch_request()
+            webhook_url = watch_request["address"]
 
             request = service.events().watch(calendarId=calendar_id, body=watch_request)
             response = self._execute_with_rate_limiting(
@@ -424,6 +537,141 @@ class GoogleCalendarClient:
             )
             return None
 
+    def setup_webhooks_batch(self, calendars, force_recreate: bool = False) -> dict:
+        """
+        Register webhooks for several calendars of this account in batched calls.
+
+        Same cron-safe behaviour as setup_webhook, but old channels are stopped
+        and new channels are watched through Google's batch endpoint, so M
+        calendars cost ceil(M/50) round-trips instead of M. Watches that hit a
+        rate limit are retried with backoff like single setup_webhook calls.
+
+        Args:
+            calendars: Calendar objects belonging to this client's account
+            force_recreate: Force webhook recreation even if valid one exists
+
+        Returns:
+            Dict mapping calendar pk to webhook info (same shape as
+            setup_webhook), or None when setup failed for that calendar
+        """
+        results = {}
+        to_setup = []
+
+        for calendar in calendars:
+            if not force_recreate and calendar.has_active_webhook(buffer_hours=24):
+                results[calendar.pk] = {
+                    "channel_id": calendar.webhook_channel_id,
+                    "webhook_url": _webhook_address(),
+                    "expires_at": calendar.webhook_expires_at,
+                    "skipped": True,
+                }
+            else:
+                to_setup.append(calendar)
+
+        if not to_setup:
+            return results
+
+        try:
+            service = self._get_service()
+
+            # Stop old channels first (prevent duplicates)
+            self._cleanup_old_webhooks_batch(to_setup)
+
+            pending = {}
+            watch_requests = []
+            for calendar in to_setup:
+                channel_id, expiration_time, watch_request = self._build_watch_request()
+                pending[str(calendar.pk)] = (calendar, channel_id, expiration_time)
+                watch_requests.append(
+                    (
+                        str(calendar.pk),
+                        service.events().watch(
+                            calendarId=calendar.google_calendar_id, body=watch_request
+                        ),
+                    )
+                )
+
+            watched = self._execute_batch(
+                watch_requests, f"setup_webhooks batch for {self.account.email}"
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Unexpected error setting up webhooks for {self.account.email}: {e}"
+            )
+            results.update(dict.fromkeys(c.pk for c in to_setup))
+            return results
+
+        for key, (calendar, channel_id, expiration_time) in pending.items():
+            response = watched.get(key)
+            if response is None or isinstance(response, Exception):
+                logger.error(
+                    f"Failed to setup webhook for calendar {calendar.google_calendar_id}: {response}"
+                )
+                results[calendar.pk] = None
+                continue
+
+            # Store webhook info in database (enables cron-safe behavior)
+            calendar.update_webhook_info(channel_id, expiration_time)
+            logger.info(
+                f"Created webhook for calendar {calendar.google_calendar_id} with channel {channel_id}"
+            )
+            results[calendar.pk] = {
+                "channel_id": channel_id,
+                "webhook_url": _webhook_address(),
+                "expires_at": expiration_time,
+                "resource_id": response.get("resourceId"),
+                "resource_uri": response.get("resourceUri"),
+            }
+
+        return results
+
+    def _cleanup_old_webhooks_batch(self, calendars):
+        """Stop existing webhook channels in batched calls (best effort)"""
+        service = self._get_service()
+        stop_requests = [
+            (
+                str(calendar.pk),
+                service.channels().stop(
+                    body={
+                        "id": calendar.webhook_channel_id,
+                        "resourceId": calendar.google_calendar_id,
+                    }
+                ),
+            )
+            for calendar in calendars
+            if calendar.webhook_channel_id
+        ]
+        if not stop_requests:
+            return
+
+        stopped = self._execute_batch(
+            stop_requests, f"cleanup_webhooks batch for {self.account.email}"
+        )
+        for key, outcome in stopped.items():
+            if isinstance(outcome, Exception):
+                # Don't fail - old webhook might have already expired
+                logger.warning(
+                    f"Failed to cleanup old webhook for calendar {key}: {outcome}"
+                )
+
+    def _build_watch_request(self):
+        """Build a new webhook channel: (channel_id, expiration_time, watch body)"""
+        # Generate unique channel ID
+        channel_id = f"{WebhookConstants.CHANNEL_ID_PREFIX}{uuid.uuid4().hex[:8]}"
+
+        # Set expiration (Google allows max 7 days for calendar events)
+        expiration_time = timezone.now() + timedelta(days=6)  # 6 days for safety
+        expiration_timestamp = int(expiration_time.timestamp() * 1000)  # Milliseconds
+
+        watch_request = {
+            "id": channel_id,
+            "type": "web_hook",
+            "address": _webhook_address(),
+            "expiration": expiration_timestamp,
+        }
+        return channel_id, expiration_time, watch_request
+
     def _cleanup_old_webhook(self, old_channel_id: str, calendar_id: str):
         """Clean up old webhook subscription to prevent duplicates"""
         try:
@@ -265,6 +265,7 @@ class UUIDCorrelationSyncEngine:
                 target_calendar=target_calendar,
                 source_uuid=source_event_state.uuid,
                 title=source_event_state.title or "Event",
+                origin_calendar_id=source_event_state.calendar_id,
             )
 
             # Create busy block in Google Calendar with UUID correlation
@@ -5,10 +5,11 @@ Tests that the bidirectional cleanup completely removes all sync relationships.
 """
 
 from datetime import timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db.models import Count
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from apps.accounts.models import UserProfile
@@ -22,24 +23,38 @@ User = get_user_model()
 class GoneGoneCleanupTest(TestCase):
     """Test the 'Gone Gone' cleanup policy"""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Patch the Google client once for the whole class
+        cls.client_patcher = patch(
+            'apps.calendars.services.google_calendar_client.GoogleCalendarClient'
+        )
+        mock_client_class = cls.client_patcher.start()
+        cls.addClassCleanup(cls.client_patcher.stop)
+        cls.mock_client = mock_client_class.return_value
+
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data with multiple calendars and cross-calendar busy blocks"""
+        # Built once for the class - each test's changes are rolled back afterwards
+
         # Create test user
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username="gonetest",
             email="gonetest@example.com",
             password="testpass123"
         )
 
         # Create user profile
-        self.profile = UserProfile.objects.create(
-            user=self.user,
+        cls.profile = UserProfile.objects.create(
+            user=cls.user,
             sync_enabled=True,
         )
 
         # Create calendar account
-        self.account = CalendarAccount.objects.create(
-            user=self.user,
+        cls.account = CalendarAccount.objects.create(
+            user=cls.user,
             google_account_id="gonetest@example.com",
             email="gonetest@example.com",
             access_token="encrypted_token",
@@ -48,133 +63,122 @@ class GoneGoneCleanupTest(TestCase):
             is_active=True,
         )
 
-        # Create three calendars
-        self.calendar1 = Calendar.objects.create(
-            calendar_account=self.account,
-            google_calendar_id="cal1_gone_test",
-            name="Work Calendar",
-            sync_enabled=True,
-        )
-
-        self.calendar2 = Calendar.objects.create(
-            calendar_account=self.account,
-            google_calendar_id="cal2_gone_test",
-            name="Personal Calendar",
-            sync_enabled=True,
-        )
-
-        self.calendar3 = Calendar.objects.create(
-            calendar_account=self.account,
-            google_calendar_id="cal3_gone_test",
-            name="Family Calendar",
-            sync_enabled=True,
+        # Create three calendars - one INSERT
+        cls.calendar1, cls.calendar2, cls.calendar3 = Calendar.objects.bulk_create(
+            [
+                Calendar(
+                    calendar_account=cls.account,
+                    google_calendar_id=google_calendar_id,
+                    name=name,
+                    sync_enabled=True,
+                )
+                for google_calendar_id, name in [
+                    ("cal1_gone_test", "Work Calendar"),
+                    ("cal2_gone_test", "Personal Calendar"),
+                    ("cal3_gone_test", "Family Calendar"),
+                ]
+            ]
         )
 
         # Create test events and busy blocks
-        self._create_test_events_and_busy_blocks()
+        cls._create_test_events_and_busy_blocks()
 
-    def _create_test_events_and_busy_blocks(self):
+    @classmethod
+    def _create_test_events_and_busy_blocks(cls):
         """Create test events and cross-calendar busy blocks"""
         now = timezone.now()
-
-        # Create user events in calendar1
-        self.event1 = EventState.create_user_event(
-            calendar=self.calendar1,
-            google_event_id="event1_google_id",
-            title="Work Meeting",
-            start_time=now + timedelta(hours=1),
-            end_time=now + timedelta(hours=2),
-        )
-        self.event1.mark_synced("event1_google_id")
-
-        self.event2 = EventState.create_user_event(
-            calendar=self.calendar1,
-            google_event_id="event2_google_id",
-            title="Project Review",
-            start_time=now + timedelta(hours=3),
-            end_time=now + timedelta(hours=4),
-        )
-        self.event2.mark_synced("event2_google_id")
-
-        # Create user event in calendar2
-        self.event3 = EventState.create_user_event(
-            calendar=self.calendar2,
-            google_event_id="event3_google_id",
-            title="Doctor Appointment",
-            start_time=now + timedelta(hours=5),
-            end_time=now + timedelta(hours=6),
-        )
-        self.event3.mark_synced("event3_google_id")
-
-        # Create busy blocks: calendar1 events → calendar2 and calendar3
-        self.busy_block1_in_cal2 = EventState.create_busy_block(
-            target_calendar=self.calendar2,
-            source_uuid=self.event1.uuid,
-            title="Work Meeting",
-        )
-        self.busy_block1_in_cal2.mark_synced("busy1_cal2_google_id")
-
-        self.busy_block1_in_cal3 = EventState.create_busy_block(
-            target_calendar=self.calendar3,
-            source_uuid=self.event1.uuid,
-            title="Work Meeting",
-        )
-        self.busy_block1_in_cal3.mark_synced("busy1_cal3_google_id")
-
-        self.busy_block2_in_cal2 = EventState.create_busy_block(
-            target_calendar=self.calendar2,
-            source_uuid=self.event2.uuid,
-            title="Project Review",
-        )
-        self.busy_block2_in_cal2.mark_synced("busy2_cal2_google_id")
-
-        self.busy_block2_in_cal3 = EventState.create_busy_block(
-            target_calendar=self.calendar3,
-            source_uuid=self.event2.uuid,
-            title="Project Review",
+        # One-hour slots starting 1, 3 and 5 hours out, computed once
+        slots = [(now + timedelta(hours=h), now + timedelta(hours=h + 1)) for h in (1, 3, 5)]
+
+        # User events, built already synced - one INSERT instead of create + mark_synced
+        def user_event(calendar, google_event_id, title, slot):
+            start_time, end_time = slot
+            return EventState(
+                calendar=calendar,
+                google_event_id=google_event_id,
+                status="SYNCED",
+                is_busy_block=False,
+                title=title,
+                start_time=start_time,
+                end_time=end_time,
+                last_seen_at=now,
+            )
+
+        cls.event1, cls.event2, cls.event3 = EventState.objects.bulk_create(
+            [
+                # calendar1 events
+                user_event(cls.calendar1, "event1_google_id", "Work Meeting", slots[0]),
+                user_event(cls.calendar1, "event2_google_id", "Project Review", slots[1]),
+                # calendar2 event
+                user_event(cls.calendar2, "event3_google_id", "Doctor Appointment", slots[2]),
+            ]
         )
-        self.busy_block2_in_cal3.mark_synced("busy2_cal3_google_id")
 
-        # Create busy blocks: calendar2 events → calendar1 and calendar3
-        self.busy_block3_in_cal1 = EventState.create_busy_block(
-            target_calendar=self.calendar1,
-            source_uuid=self.event3.uuid,
-            title="Doctor Appointment",
-        )
-        self.busy_block3_in_cal1.mark_synced("busy3_cal1_google_id")
-
-        self.busy_block3_in_cal3 = EventState.create_busy_block(
-            target_calendar=self.calendar3,
-            source_uuid=self.event3.uuid,
-            title="Doctor Appointment",
+        # Synced busy blocks - UUIDs are assigned client-side, so the sources'
+        # uuids are known without reading them back
+        def busy_block(target_calendar, source_event, google_event_id):
+            return EventState(
+                calendar=target_calendar,
+                google_event_id=google_event_id,
+                status="SYNCED",
+                is_busy_block=True,
+                source_uuid=source_event.uuid,
+                origin_calendar_id=source_event.calendar_id,
+                title=f"Busy - {source_event.title}",
+                last_seen_at=now,
+            )
+
+        EventState.objects.bulk_create(
+            [
+                # calendar1 events → calendar2 and calendar3
+                busy_block(cls.calendar2, cls.event1, "busy1_cal2_google_id"),
+                busy_block(cls.calendar3, cls.event1, "busy1_cal3_google_id"),
+                busy_block(cls.calendar2, cls.event2, "busy2_cal2_google_id"),
+                busy_block(cls.calendar3, cls.event2, "busy2_cal3_google_id"),
+                # calendar2 event → calendar1 and calendar3
+                busy_block(cls.calendar1, cls.event3, "busy3_cal1_google_id"),
+                busy_block(cls.calendar3, cls.event3, "busy3_cal3_google_id"),
+            ]
         )
-        self.busy_block3_in_cal3.mark_synced("busy3_cal3_google_id")
 
-    def _analyze_sync_state(self, description):
-        """Analyze and log current sync state"""
-        cal1_user_events = self.calendar1.event_states.filter(is_busy_block=False).count()
-        cal1_busy_blocks = self.calendar1.event_states.filter(is_busy_block=True).count()
+    def setUp(self):
+        # Calls from earlier tests don't count, and every Google delete succeeds
+        self.mock_client.reset_mock()
+        self.mock_client.batch_delete_events.side_effect = self._delete_all
+
+    @staticmethod
+    def _delete_all(calendar_id, event_ids):
+        """Stand-in for GoogleCalendarClient.batch_delete_events where every delete succeeds"""
+        return dict.fromkeys(event_ids, True)
+
+    def _analyze_sync_state(self):
+        """Count user events and busy blocks per calendar"""
+        # One grouped COUNT for all three calendars instead of one query per figure
+        counts = {
+            (row['calendar_id'], row['is_busy_block']): row['n']
+            for row in EventState.objects.filter(
+                calendar__in=[self.calendar1, self.calendar2, self.calendar3]
+            )
+            .values('calendar_id', 'is_busy_block')
+            .annotate(n=Count('uuid'))
+        }
+        cal1_user_events = counts.get((self.calendar1.id, False), 0)
+        cal1_busy_blocks = counts.get((self.calendar1.id, True), 0)
 
-        cal2_user_events = self.calendar2.event_states.filter(is_busy_block=False).count()
-        cal2_busy_blocks = self.calendar2.event_states.filter(is_busy_block=True).count()
+        cal2_user_events = counts.get((self.calendar2.id, False), 0)
+        cal2_busy_blocks = counts.get((self.calendar2.id, True), 0)
 
-        cal3_user_events = self.calendar3.event_states.filter(is_busy_block=False).count()
-        cal3_busy_blocks = self.calendar3.event_states.filter(is_busy_block=True).count()
+        cal3_user_events = counts.get((self.calendar3.id, False), 0)
+        cal3_busy_blocks = counts.get((self.calendar3.id, True), 0)
 
-        # Count outbound busy blocks from calendar1
-        cal1_user_uuids = list(self.calendar1.event_states.filter(is_busy_block=False).values_list('uuid', flat=True))
+        # Count outbound busy blocks from calendar1 the way cleanup finds them - by
+        # origin calendar, which still holds once calendar1's user events are gone
         outbound_busy_blocks = EventState.objects.filter(
             calendar__in=[self.calendar2, self.calendar3],
             is_busy_block=True,
-            source_uuid__in=cal1_user_uuids
+            origin_calendar=self.calendar1,
         ).count()
 
-        print(f"\n📊 {description}:")
-        print(f"   Work Calendar: {cal1_user_events} user events, {cal1_busy_blocks} busy blocks")
-        print(f"   Personal Calendar: {cal2_user_events} user events, {cal2_busy_blocks} busy blocks")
-        print(f"   Family Calendar: {cal3_user_events} user events, {cal3_busy_blocks} busy blocks")
-        print(f"   Outbound busy blocks from Work Calendar: {outbound_busy_blocks}")
-
         return {
             'cal1_user_events': cal1_user_events,
             'cal1_busy_blocks': cal1_busy_blocks,
@@ -185,78 +189,65 @@ class GoneGoneCleanupTest(TestCase):
             'outbound_busy_blocks': outbound_busy_blocks,
         }
 
-    @patch('apps.calendars.services.google_calendar_client.GoogleCalendarClient')
-    def test_gone_gone_cleanup_policy(self, mock_client_class):
+    def test_gone_gone_cleanup_policy(self):
         """Test complete 'Gone Gone' cleanup when calendar sync is toggled off"""
-        print("\n🎯 TESTING 'Gone Gone' CLEANUP POLICY")
-        print("=" * 50)
-
-        # Setup mock client
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        mock_client.delete_event.return_value = True
 
         # Analyze initial state
-        before_stats = self._analyze_sync_state("BEFORE CLEANUP")
+        before_stats = self._analyze_sync_state()
 
         # Verify initial setup
         self.assertEqual(before_stats['cal1_user_events'], 2)  # event1, event2
-        self.assertEqual(before_stats['cal1_busy_blocks'], 1)  # busy_block3_in_cal1
+        self.assertEqual(before_stats['cal1_busy_blocks'], 1)  # event3's block
         self.assertEqual(before_stats['cal2_user_events'], 1)  # event3
-        self.assertEqual(before_stats['cal2_busy_blocks'], 2)  # busy_block1_in_cal2, busy_block2_in_cal2
+        self.assertEqual(before_stats['cal2_busy_blocks'], 2)  # event1's and event2's blocks
         self.assertEqual(before_stats['cal3_user_events'], 0)  # no user events
         self.assertEqual(before_stats['cal3_busy_blocks'], 3)  # all busy blocks
         self.assertEqual(before_stats['outbound_busy_blocks'], 4)  # 2 events × 2 target calendars
 
         # Toggle calendar1 sync OFF (triggers 'Gone Gone' cleanup)
-        print(f"\n🚀 Toggling {self.calendar1.name} sync OFF...")
         service = CalendarService(user=self.user)
         result = service.toggle_calendar_sync(self.calendar1.id)
 
         # Verify toggle result
         self.assertFalse(result.sync_enabled)
         self.assertTrue(result.cleanup_pending)
-        print(f"   ✅ Calendar sync disabled: {result.sync_enabled}")
-        print(f"   ⏳ Calendar marked for cleanup: {result.cleanup_pending}")
 
         # Simulate async cleanup execution (what the cleanup command would do)
-        print("   🔄 Running async cleanup...")
         service._execute_gone_gone_cleanup(result)
 
         # Verify Google Calendar deletions were called
-        google_delete_calls = mock_client.delete_event.call_count
-        print(f"   🗑️  Google Calendar delete_event called {google_delete_calls} times")
+        google_delete_calls = sum(
+            len(c.args[1]) for c in self.mock_client.batch_delete_events.call_args_list
+        )
+
+        # One batched call per target calendar, not one per busy block
+        self.assertEqual(self.mock_client.batch_delete_events.call_count, 2)
 
         # Analyze state after cleanup
-        after_stats = self._analyze_sync_state("AFTER CLEANUP")
+        after_stats = self._analyze_sync_state()
 
         # VERIFICATION: Gone Gone Policy Requirements
-        print("\n🏆 GONE GONE POLICY VERIFICATION:")
 
         # Requirement 1: All EventState records removed from calendar1
         self.assertEqual(after_stats['cal1_user_events'], 0,
                         "Calendar1 should have zero user events after cleanup")
         self.assertEqual(after_stats['cal1_busy_blocks'], 0,
                         "Calendar1 should have zero busy blocks after cleanup")
-        print("   ✅ Local cleanup: All EventState records removed from toggled calendar")
 
         # Requirement 2: All outbound busy blocks removed from other calendars
         self.assertEqual(after_stats['outbound_busy_blocks'], 0,
                         "No busy blocks from calendar1 should remain in other calendars")
-        print("   ✅ Outbound cleanup: All busy blocks removed from other calendars")
 
         # Requirement 3: Google Calendar deletions called for each outbound busy block
         expected_google_deletes = before_stats['outbound_busy_blocks']
         self.assertEqual(google_delete_calls, expected_google_deletes,
                         f"Expected {expected_google_deletes} Google deletions, got {google_delete_calls}")
-        print(f"   ✅ Google cleanup: {google_delete_calls} busy blocks deleted from Google Calendar")
 
         # Requirement 4: Other calendars' user events preserved
         self.assertEqual(after_stats['cal2_user_events'], before_stats['cal2_user_events'],
                         "Calendar2 user events should be unchanged")
         self.assertEqual(after_stats['cal3_user_events'], before_stats['cal3_user_events'],
                         "Calendar3 user events should be unchanged")
-        print("   ✅ Preservation: Other calendars' user events unchanged")
 
         # Requirement 5: Verify specific busy blocks were removed
         # Calendar2 should have lost 2 busy blocks (from calendar1)
@@ -269,11 +260,6 @@ class GoneGoneCleanupTest(TestCase):
         self.assertEqual(after_stats['cal3_busy_blocks'], expected_cal3_busy_after,
                         f"Calendar3 should have {expected_cal3_busy_after} busy blocks after cleanup")
 
-        # Summary verification
-        total_busy_blocks_removed = (before_stats['cal2_busy_blocks'] - after_stats['cal2_busy_blocks'] +
-                                   before_stats['cal3_busy_blocks'] - after_stats['cal3_busy_blocks'])
-        print(f"   📊 Summary: {total_busy_blocks_removed} busy blocks removed across other calendars")
-
         # Final validation: Calendar1 is completely isolated
         remaining_calendar1_relationships = EventState.objects.filter(
             calendar=self.calendar1
@@ -287,20 +273,8 @@ class GoneGoneCleanupTest(TestCase):
         self.assertEqual(remaining_outbound_relationships, 0,
                         "No EventState records should reference calendar1's events")
 
-        print("\n" + "=" * 50)
-        print("🎉 'GONE GONE' POLICY TEST: PASSED")
-        print("✅ Complete bidirectional cleanup verified")
-        print("✅ Calendar is completely isolated from sync system")
-        print("✅ Ready for clean re-enablement")
-
-    @patch('apps.calendars.services.google_calendar_client.GoogleCalendarClient')
-    def test_gone_gone_policy_isolation(self, mock_client_class):
+    def test_gone_gone_policy_isolation(self):
         """Test that 'Gone Gone' cleanup creates complete isolation"""
-        # Setup mock
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        mock_client.delete_event.return_value = True
-
         # Record original UUIDs
         original_event1_uuid = self.event1.uuid
         original_event2_uuid = self.event2.uuid
@@ -324,16 +298,53 @@ class GoneGoneCleanupTest(TestCase):
         self.assertEqual(calendar1_events.count(), 0,
                         "Calendar1 should have completely clean EventState slate")
 
-        print("✅ Complete isolation verified - calendar is 'gone gone'")
+    @override_settings(CLEANUP_BATCH_SIZE=1)
+    def test_outbound_cleanup_across_batches(self):
+        """Test that batched outbound cleanup removes every busy block exactly once"""
+        service = CalendarService(user=self.user)
+        # Other calendars + one SELECT of the busy blocks, then one DELETE per batch
+        with self.assertNumQueries(6):
+            cleaned = service._cleanup_outbound_busy_blocks(self.calendar1)
+
+        # 2 source events, each with a block in calendar2 and calendar3
+        self.assertEqual(cleaned, 4)
+        # One busy block per batch, so one batched Google call each
+        self.assertEqual(self.mock_client.batch_delete_events.call_count, 4)
+        self.assertFalse(
+            EventState.objects.filter(
+                source_uuid__in=[self.event1.uuid, self.event2.uuid]
+            ).exists()
+        )
+        # calendar2's event still has its busy blocks
+        self.assertEqual(
+            EventState.objects.filter(source_uuid=self.event3.uuid).count(), 2
+        )
 
-    @patch('apps.calendars.services.google_calendar_client.GoogleCalendarClient')
-    def test_gone_gone_preserves_other_relationships(self, mock_client_class):
-        """Test that 'Gone Gone' cleanup preserves unrelated sync relationships"""
-        # Setup mock
-        mock_client = MagicMock()
-        mock_client_class.return_value = mock_client
-        mock_client.delete_event.return_value = True
+    def test_failed_google_delete_still_removes_busy_block(self):
+        """Test that a failed Google delete is logged and the record still removed"""
+        failed_event_id = "busy1_cal2_google_id"
+        self.mock_client.batch_delete_events.side_effect = (
+            lambda calendar_id, event_ids: {
+                event_id: event_id != failed_event_id for event_id in event_ids
+            }
+        )
 
+        service = CalendarService(user=self.user)
+        with self.assertLogs(service.logger, level="WARNING") as logs:
+            cleaned = service._cleanup_outbound_busy_blocks(self.calendar1)
+
+        self.assertEqual(cleaned, 4)
+        self.assertFalse(
+            EventState.objects.filter(
+                source_uuid__in=[self.event1.uuid, self.event2.uuid]
+            ).exists()
+        )
+        self.assertTrue(
+            any("Google delete failed for 1 busy blocks" in line for line in logs.output)
+        )
+
+    def test_gone_gone_preserves_other_relationships(self):
+        """Test that 'Gone Gone' cleanup preserves unrelated sync relationships"""
         # Record pre-cleanup state of calendar2 → calendar3 relationship
         cal2_to_cal3_busy_blocks_before = EventState.objects.filter(
             calendar=self.calendar3,
@@ -361,5 +372,3 @@ class GoneGoneCleanupTest(TestCase):
             is_busy_block=False
         ).count()
         self.assertEqual(cal2_user_events, 1, "Calendar2 user events should be preserved")
-
-        print("✅ Unrelated sync relationships preserved during cleanup")
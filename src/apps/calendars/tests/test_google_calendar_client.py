@@ -9,7 +9,7 @@ from django.utils import timezone
 from googleapiclient.errors import HttpError
 
 from apps.accounts.models import UserProfile
-from apps.calendars.models import CalendarAccount
+from apps.calendars.models import Calendar, CalendarAccount
 from apps.calendars.services.google_calendar_client import (
     GoogleCalendarClient,
     get_google_calendar_client,
@@ -41,6 +41,30 @@ class GoogleCalendarClientTest(TestCase):
         self.account.set_refresh_token("test_refresh_token")
         self.account.save()
 
+    def _fake_batches(self, mock_service, respond):
+        """
+        Make the service hand out fake BatchHttpRequests that answer each added
+        request on execute() with respond(request_id) -> (response, exception).
+        Returns the list the created batches are collected in.
+        """
+        batches = []
+
+        def new_batch(callback):
+            batch = MagicMock()
+            batch.requests = []
+            batch.add.side_effect = lambda request, request_id: batch.requests.append(
+                request_id
+            )
+            batch.execute.side_effect = lambda: [
+                callback(request_id, *respond(request_id))
+                for request_id in batch.requests
+            ]
+            batches.append(batch)
+            return batch
+
+        mock_service.new_batch_http_request.side_effect = new_batch
+        return batches
+
     @patch("apps.calendars.services.google_calendar_client.build")
     def test_client_initialization(self, mock_build):
         """Test client initialization and service creation"""
@@ -92,6 +116,50 @@ class GoogleCalendarClientTest(TestCase):
 
         self.assertEqual(calendars, [])
 
+    @patch("apps.calendars.services.google_calendar_client.build")
+    def test_list_calendars_changes_with_sync_token(self, mock_build):
+        """Test incremental calendar listing returns changes and the next token"""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+
+        changed = [{"id": "calendar2", "summary": "Renamed Calendar"}]
+        mock_service.calendarList().list().execute.return_value = {
+            "items": changed,
+            "nextSyncToken": "token-2",
+        }
+
+        client = GoogleCalendarClient(self.account)
+        calendars, next_sync_token, full_list = client.list_calendars_changes("token-1")
+
+        self.assertEqual(calendars, changed)
+        self.assertEqual(next_sync_token, "token-2")
+        self.assertFalse(full_list)
+        mock_service.calendarList().list.assert_called_with(syncToken="token-1")
+
+    @patch("apps.calendars.services.google_calendar_client.build")
+    def test_list_calendars_changes_expired_token(self, mock_build):
+        """Test an expired sync token (410 Gone) falls back to a full list"""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+
+        mock_response = MagicMock()
+        mock_response.status = 410
+        full_list = [{"id": "primary", "summary": "Primary Calendar"}]
+        mock_service.calendarList().list().execute.side_effect = [
+            HttpError(mock_response, b"Gone"),
+            {"items": full_list, "nextSyncToken": "fresh-token"},
+        ]
+
+        client = GoogleCalendarClient(self.account)
+        calendars, next_sync_token, is_full_list = client.list_calendars_changes(
+            "stale-token"
+        )
+
+        self.assertEqual(calendars, full_list)
+        self.assertEqual(next_sync_token, "fresh-token")
+        self.assertTrue(is_full_list)
+        mock_service.calendarList().list.assert_called_with()
+
     @patch("apps.calendars.services.google_calendar_client.build")
     def test_get_calendar_success(self, mock_build):
         """Test successful calendar retrieval"""
@@ -315,19 +383,172 @@ class GoogleCalendarClientTest(TestCase):
         mock_service = MagicMock()
         mock_build.return_value = mock_service
 
+        def respond(request_id):
+            # Google answers a delete with an empty body, or an error per request
+            statuses = {"event2": 404, "event3": 500}
+            if request_id not in statuses:
+                return "", None
+            error_response = MagicMock()
+            error_response.status = statuses[request_id]
+            return None, HttpError(error_response, b"error")
+
+        batches = self._fake_batches(mock_service, respond)
+
         client = GoogleCalendarClient(self.account)
         event_ids = ["event1", "event2", "event3"]
 
         results = client.batch_delete_events("cal123", event_ids)
 
-        # Should attempt to delete all events
-        self.assertEqual(len(results), 3)
-        for event_id in event_ids:
-            self.assertTrue(results[event_id])
+        # Already-deleted events count as deleted, other errors do not
+        self.assertEqual(results, {"event1": True, "event2": True, "event3": False})
 
-        # Verify correct number of delete calls
+        # All three deletes go out in a single batched call
+        self.assertEqual(len(batches), 1)
         self.assertEqual(mock_service.events().delete.call_count, 3)
 
+    @patch("apps.calendars.services.google_calendar_client.time.sleep")
+    @patch("apps.calendars.services.google_calendar_client.build")
+    def test_batch_delete_rate_limited_items_retried(self, mock_build, mock_sleep):
+        """Test that rate-limited deletes inside a batch are re-sent with backoff"""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        attempts = {}
+
+        def respond(request_id):
+            # event2 is rate limited once, event3 on every attempt
+            attempts[request_id] = attempts.get(request_id, 0) + 1
+            if request_id == "event3" or (
+                request_id == "event2" and attempts[request_id] == 1
+            ):
+                error_response = MagicMock()
+                error_response.status = 403
+                content = (
+                    b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'
+                )
+                return None, HttpError(error_response, content)
+            return "", None
+
+        batches = self._fake_batches(mock_service, respond)
+
+        client = GoogleCalendarClient(self.account)
+        results = client.batch_delete_events("cal123", ["event1", "event2", "event3"])
+
+        self.assertEqual(results, {"event1": True, "event2": True, "event3": False})
+        # Only the rate-limited requests are re-sent, until retries run out
+        self.assertEqual(
+            [batch.requests for batch in batches],
+            [
+                ["event1", "event2", "event3"],
+                ["event2", "event3"],
+                ["event3"],
+                ["event3"],
+            ],
+        )
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [3, 6, 12])
+
+    @patch("apps.calendars.services.google_calendar_client.build")
+    def test_setup_webhooks_batch(self, mock_build):
+        """Test webhooks for several calendars are set up in one batched call"""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        batches = self._fake_batches(
+            mock_service,
+            lambda request_id: ({"resourceId": f"res-{request_id}"}, None),
+        )
+
+        calendars = [
+            Calendar.objects.create(
+                calendar_account=self.account,
+                name=f"Calendar {i}",
+                google_calendar_id=f"batch_cal_{i}",
+                sync_enabled=True,
+            )
+            for i in range(3)
+        ]
+
+        client = GoogleCalendarClient(self.account)
+        results = client.setup_webhooks_batch(calendars)
+
+        # No old channels to stop, so one batch carrying all three watches
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0].add.call_count, 3)
+        for calendar in calendars:
+            calendar.refresh_from_db()
+            self.assertEqual(
+                results[calendar.pk]["channel_id"], calendar.webhook_channel_id
+            )
+            self.assertEqual(results[calendar.pk]["resource_id"], f"res-{calendar.pk}")
+
+    @patch("apps.calendars.services.google_calendar_client.time.sleep")
+    @patch("apps.calendars.services.google_calendar_client.build")
+    def test_setup_webhooks_batch_retries_rate_limited_watch(
+        self, mock_build, mock_sleep
+    ):
+        """Test that a rate-limited watch in the batch is retried, not reported failed"""
+        mock_service = MagicMock()
+        mock_build.return_value = mock_service
+        calendars = [
+            Calendar.objects.create(
+                calendar_account=self.account,
+                name=f"Calendar {i}",
+                google_calendar_id=f"retry_cal_{i}",
+                sync_enabled=True,
+            )
+            for i in range(2)
+        ]
+        limited_key = str(calendars[1].pk)
+        attempts = []
+
+        def respond(request_id):
+            attempts.append(request_id)
+            if request_id == limited_key and attempts.count(request_id) == 1:
+                error_response = MagicMock()
+                error_response.status = 403
+                return None, HttpError(error_response, b'"rateLimitExceeded"')
+            return {"resourceId": f"res-{request_id}"}, None
+
+        batches = self._fake_batches(mock_service, respond)
+
+        client = GoogleCalendarClient(self.account)
+        results = client.setup_webhooks_batch(calendars)
+
+        # The second batch re-sends just the rate-limited watch
+        self.assertEqual(batches[1].requests, [limited_key])
+        mock_sleep.assert_called_once_with(3)
+        for calendar in calendars:
+            calendar.refresh_from_db()
+            self.assertEqual(
+                results[calendar.pk]["channel_id"], calendar.webhook_channel_id
+            )
+
+    @patch("apps.calendars.services.google_calendar_client.time.sleep")
+    def test_rate_limit_errors_retried(self, mock_sleep):
+        """Test that only 403 rate limit / quota errors are retried"""
+        client = GoogleCalendarClient(self.account)
+
+        for content, retried in [
+            (b'{"error": {"errors": [{"reason": "rateLimitExceeded"}]}}', True),
+            (b'{"error": {"errors": [{"reason": "quotaExceeded"}]}}', True),
+            (b'{"error": {"errors": [{"reason": "forbidden"}]}}', False),
+        ]:
+            with self.subTest(content=content):
+                mock_response = MagicMock()
+                mock_response.status = 403
+                request = MagicMock()
+                request.execute.side_effect = [
+                    HttpError(mock_response, content),
+                    {"id": "ok"},
+                ]
+
+                if retried:
+                    result = client._execute_with_rate_limiting(request, "test op")
+                    self.assertEqual(result, {"id": "ok"})
+                else:
+                    with self.assertRaises(HttpError):
+                        client._execute_with_rate_limiting(request, "test op")
+
+        self.assertEqual(mock_sleep.call_count, 2)
+
     def test_factory_function(self):
         """Test factory function for creating client"""
         client = get_google_calendar_client(self.account)
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.contrib.admin.sites import site
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.test import TestCase
@@ -256,6 +257,37 @@ class CalendarModelTest(TestCase):
         calendar.refresh_from_db()
         self.assertEqual(calendar.last_synced_at, now)
 
+    def test_delete_resets_calendar_list_sync_token(self):
+        """Test deleting a calendar makes the next calendar list refresh a full one"""
+        calendar = Calendar.objects.create(
+            calendar_account=self.account,
+            google_calendar_id="cal123",
+            name="Work Calendar",
+        )
+        self.account.calendar_list_sync_token = "token-1"
+        self.account.save()
+
+        calendar.delete()
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.calendar_list_sync_token, "")
+
+    def test_admin_bulk_delete_resets_calendar_list_sync_token(self):
+        """Test the admin's bulk delete also resets the calendar list sync token"""
+        Calendar.objects.create(
+            calendar_account=self.account,
+            google_calendar_id="cal123",
+            name="Work Calendar",
+        )
+        self.account.calendar_list_sync_token = "token-1"
+        self.account.save()
+
+        site._registry[Calendar].delete_queryset(None, Calendar.objects.all())
+
+        self.assertFalse(Calendar.objects.exists())
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.calendar_list_sync_token, "")
+
 
 class EventModelTest(TestCase):
     def setUp(self):
@@ -69,6 +69,38 @@ class TestEventStateModel(TestCase):
         self.assertEqual(busy_block.source_uuid, source_uuid)
         self.assertEqual(busy_block.title, "Busy - Important Meeting")
         self.assertIsNone(busy_block.google_event_id)  # Not synced yet
+        self.assertIsNone(busy_block.origin_calendar_id)  # Unknown source
+
+    def test_create_busy_block_origin_calendar(self):
+        """Test busy blocks record the calendar their source event lives in"""
+        other_calendar = Calendar.objects.create(
+            calendar_account=self.account,
+            name="Other Calendar",
+            google_calendar_id="other@example.com"
+        )
+        source = EventState.create_user_event(
+            calendar=self.calendar,
+            google_event_id="google_source",
+            title="Source Meeting"
+        )
+
+        # Looked up from the source event when not given
+        busy_block = EventState.create_busy_block(
+            target_calendar=other_calendar,
+            source_uuid=source.uuid,
+            title=source.title
+        )
+        self.assertEqual(busy_block.origin_calendar_id, self.calendar.id)
+
+        # Taken as passed, with no lookup
+        with self.assertNumQueries(1):
+            busy_block = EventState.create_busy_block(
+                target_calendar=other_calendar,
+                source_uuid=source.uuid,
+                title=source.title,
+                origin_calendar_id=source.calendar_id
+            )
+        self.assertEqual(busy_block.origin_calendar_id, self.calendar.id)
 
     def test_mark_synced(self):
         """Test marking event as synced"""
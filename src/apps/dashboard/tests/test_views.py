@@ -1,6 +1,9 @@
 """Tests for dashboard views and functionality"""
 
+from unittest.mock import patch
+
 from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
 from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -99,3 +102,88 @@ class DashboardViewsTest(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.assertIn("/login/", response.url)
+
+    @patch("apps.calendars.services.google_calendar_client.GoogleCalendarClient")
+    def test_refresh_calendars_no_changes(self, mock_client_class):
+        """Test an incremental refresh with no changes reports the account total"""
+        mock_client_class.return_value.list_calendars_changes.return_value = (
+            [],
+            "token-2",
+            False,
+        )
+        self.account.calendar_list_sync_token = "token-1"
+        self.account.save()
+
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(
+            reverse("dashboard:refresh_calendars", args=[self.account.id])
+        )
+
+        mock_client_class.return_value.list_calendars_changes.assert_called_once_with(
+            "token-1"
+        )
+        self.assertEqual(
+            [str(m) for m in get_messages(response.wsgi_request)],
+            ["Refreshed calendars: 1 calendars found, all up to date."],
+        )
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.calendar_list_sync_token, "token-2")
+
+    @patch("apps.calendars.services.google_calendar_client.GoogleCalendarClient")
+    def test_refresh_calendars_deleted_calendar(self, mock_client_class):
+        """Test a calendar removed on Google has sync disabled and cleanup queued"""
+        mock_client_class.return_value.list_calendars_changes.return_value = (
+            [{"id": "test_calendar_id", "deleted": True}],
+            "token-2",
+            False,
+        )
+
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(
+            reverse("dashboard:refresh_calendars", args=[self.account.id])
+        )
+
+        self.calendar.refresh_from_db()
+        self.assertFalse(self.calendar.sync_enabled)
+        self.assertTrue(self.calendar.cleanup_pending)
+        self.assertIsNotNone(self.calendar.cleanup_requested_at)
+        self.assertEqual(
+            [str(m) for m in get_messages(response.wsgi_request)],
+            [
+                "Refreshed calendars: 1 calendars were removed from Google and have "
+                "had sync disabled."
+            ],
+        )
+
+    @patch("apps.calendars.services.google_calendar_client.GoogleCalendarClient")
+    def test_refresh_calendars_full_list_missing_calendar(self, mock_client_class):
+        """Test a calendar missing from a full list (expired token) is disabled"""
+        mock_client_class.return_value.list_calendars_changes.return_value = (
+            [{"id": "other_calendar_id", "summary": "Other Calendar"}],
+            "fresh-token",
+            True,
+        )
+        self.account.calendar_list_sync_token = "stale-token"
+        self.account.save()
+
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(
+            reverse("dashboard:refresh_calendars", args=[self.account.id])
+        )
+
+        self.assertEqual(
+            [str(m) for m in get_messages(response.wsgi_request)],
+            [
+                "Refreshed calendars: 1 calendars were removed from Google and have "
+                "had sync disabled.",
+                "Refreshed calendars: found 2, added 1 new calendars.",
+            ],
+        )
+        self.calendar.refresh_from_db()
+        self.assertFalse(self.calendar.sync_enabled)
+        self.assertTrue(self.calendar.cleanup_pending)
+        self.assertTrue(
+            Calendar.objects.filter(google_calendar_id="other_calendar_id").exists()
+        )
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.calendar_list_sync_token, "fresh-token")
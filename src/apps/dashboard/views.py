@@ -54,13 +54,19 @@ def refresh_calendars(request: HttpRequest, account_id: int) -> HttpResponse:
         result = calendar_service.refresh_calendar_list(account_id)
 
         # Add user message based on results
+        if result["calendars_disabled"] > 0:
+            messages.warning(
+                request,
+                f"Refreshed calendars: {result['calendars_disabled']} calendars "
+                "were removed from Google and have had sync disabled.",
+            )
         if result["calendars_created"] > 0:
             messages.success(
                 request,
                 f"Refreshed calendars: found {result['calendars_found']}, "
                 f"added {result['calendars_created']} new calendars.",
             )
-        else:
+        elif result["calendars_disabled"] == 0:
             messages.success(
                 request,
                 f"Refreshed calendars: {result['calendars_found']} calendars found, all up to date.",
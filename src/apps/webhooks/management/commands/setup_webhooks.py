@@ -7,7 +7,9 @@ No complex subscription management - just register and go.
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db.models import F
 
+from apps.calendars.constants import WebhookConstants
 from apps.calendars.models import Calendar
 from apps.calendars.services.google_calendar_client import GoogleCalendarClient
 
@@ -15,6 +17,12 @@ from apps.calendars.services.google_calendar_client import GoogleCalendarClient
 class Command(BaseCommand):
     help = "Setup Google Calendar webhooks for all active calendars (Guilfoyle's minimalist approach - cron-safe)"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # One client per account for the whole run - avoids rebuilding credentials
+        # and the discovery-based service for every calendar of the same account
+        self._clients = {}
+
     def add_arguments(self, parser):
         parser.add_argument(
             "--calendar-id",
@@ -36,6 +44,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Force recreation of all webhooks regardless of expiration status",
         )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Maximum number of calendars to process per run, most urgent first (bounds cron runtime)",
+        )
 
     def handle(self, *args, **options):
         """Setup webhooks for active calendars"""
@@ -46,7 +59,7 @@ class Command(BaseCommand):
             )
             return
 
-        webhook_url = f"{settings.WEBHOOK_BASE_URL}/webhooks/google/"
+        webhook_url = f"{settings.WEBHOOK_BASE_URL}{WebhookConstants.GOOGLE_PATH}"
         self.stdout.write(f"Webhook URL: {webhook_url}")
 
         if options["calendar_id"]:
@@ -60,31 +73,49 @@ class Command(BaseCommand):
                 options["dry_run"],
                 check_expiring_only=options["check_expiring"],
                 force=options["force"],
+                limit=options["limit"],
             )
 
-    def _setup_all_calendars(self, dry_run, check_expiring_only=False, force=False):
+    def _setup_all_calendars(
+        self, dry_run, check_expiring_only=False, force=False, limit=None
+    ):
         """Setup webhooks for all active sync-enabled calendars (cron-safe)"""
 
-        calendars = Calendar.objects.filter(
-            sync_enabled=True, calendar_account__is_active=True
-        ).select_related("calendar_account")
+        calendars = self._select_calendars(check_expiring_only, force, limit)
+        if not calendars:
+            return
+
+        if dry_run:
+            self._report_dry_run(calendars, check_expiring_only)
+            return
+
+        self._report_summary(self._setup_webhooks_by_account(calendars, force=force))
+
+    def _select_calendars(self, check_expiring_only, force, limit):
+        """Pick the calendars to process this run, reporting how many were found"""
+
+        # Most urgent first (missing, then soonest expiring) so a --limit run
+        # always renews the webhooks that matter; the rest are picked up next run
+        calendars = (
+            Calendar.objects.filter(sync_enabled=True, calendar_account__is_active=True)
+            .select_related("calendar_account")
+            .order_by(F("webhook_expires_at").asc(nulls_first=True), "id")
+        )
 
         if not calendars.exists():
             self.stdout.write("No active sync-enabled calendars found")
-            return
+            return []
 
         # Filter calendars based on webhook status (cron-safe)
         if check_expiring_only and not force:
             # Only process calendars that need webhook renewal
-            calendars_to_process = []
-            for calendar in calendars:
-                if calendar.needs_webhook_renewal():
-                    calendars_to_process.append(calendar)
-            calendars = calendars_to_process
+            calendars = [
+                calendar for calendar in calendars if calendar.needs_webhook_renewal()
+            ]
 
             if not calendars:
                 self.stdout.write("No calendars need webhook renewal")
-                return
+                return []
 
             self.stdout.write(
                 f"Found {len(calendars)} calendars needing webhook renewal"
@@ -92,40 +123,41 @@ class Command(BaseCommand):
         else:
             self.stdout.write(f"Found {calendars.count()} active calendars")
 
-        success_count = 0
-        failure_count = 0
-        skipped_count = 0
+        if limit:
+            calendars = calendars[:limit]
+            self.stdout.write(f"Processing at most {limit} calendars this run")
+
+        return calendars
+
+    def _report_dry_run(self, calendars, check_expiring_only):
+        """Show what a real run would do for each calendar"""
 
         for calendar in calendars:
-            if dry_run:
-                webhook_status = calendar.get_webhook_status()
-                self.stdout.write(f"[DRY RUN] {calendar.name}: {webhook_status}")
-                if check_expiring_only and not calendar.needs_webhook_renewal():
-                    self.stdout.write("[DRY RUN] Would skip (webhook still valid)")
-                else:
-                    self.stdout.write("[DRY RUN] Would setup webhook")
-                continue
-
-            result = self._setup_calendar_webhook(calendar, force=force)
-            if result == "success":
-                success_count += 1
-            elif result == "skipped":
-                skipped_count += 1
+            webhook_status = calendar.get_webhook_status()
+            self.stdout.write(f"[DRY RUN] {calendar.name}: {webhook_status}")
+            if check_expiring_only and not calendar.needs_webhook_renewal():
+                self.stdout.write("[DRY RUN] Would skip (webhook still valid)")
             else:
-                failure_count += 1
+                self.stdout.write("[DRY RUN] Would setup webhook")
+
+    def _report_summary(self, results):
+        """Write the success / skipped / failed totals for a run"""
+
+        success_count = results.count("success")
+        skipped_count = results.count("skipped")
+        failure_count = len(results) - success_count - skipped_count
 
-        if not dry_run:
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully setup {success_count} webhooks")
+        )
+        if skipped_count > 0:
+            self.stdout.write(
+                f"Skipped {skipped_count} calendars (webhooks still valid)"
+            )
+        if failure_count > 0:
             self.stdout.write(
-                self.style.SUCCESS(f"Successfully setup {success_count} webhooks")
+                self.style.WARNING(f"Failed to setup {failure_count} webhooks")
             )
-            if skipped_count > 0:
-                self.stdout.write(
-                    f"Skipped {skipped_count} calendars (webhooks still valid)"
-                )
-            if failure_count > 0:
-                self.stdout.write(
-                    self.style.WARNING(f"Failed to setup {failure_count} webhooks")
-                )
 
     def _setup_single_calendar(self, calendar_id, dry_run, force=False):
         """Setup webhook for specific calendar"""
@@ -165,32 +197,73 @@ class Command(BaseCommand):
         """Setup webhook for a single calendar (cron-safe)"""
 
         try:
-            client = GoogleCalendarClient(calendar.calendar_account)
+            client = self._get_client(calendar.calendar_account)
 
             # Use the enhanced cron-safe webhook setup method
             webhook_info = client.setup_webhook(
                 calendar.google_calendar_id, force_recreate=force
             )
-
-            if webhook_info:
-                if webhook_info.get("skipped"):
-                    self.stdout.write(
-                        f"⏭ {calendar.name}: Webhook still valid "
-                        f"(expires {webhook_info['expires_at'].strftime('%Y-%m-%d %H:%M')})"
-                    )
-                    return "skipped"
-                else:
-                    self.stdout.write(
-                        f"✓ {calendar.name}: Channel {webhook_info['channel_id']} "
-                        f"(expires {webhook_info['expires_at'].strftime('%Y-%m-%d %H:%M')})"
-                    )
-                    return "success"
-            else:
-                self.stdout.write(
-                    self.style.ERROR(f"✗ {calendar.name}: Failed to create webhook")
-                )
-                return "failed"
+            return self._report_webhook_result(calendar, webhook_info)
 
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"✗ {calendar.name}: {e}"))
             return "failed"
+
+    def _setup_webhooks_by_account(self, calendars, force=False):
+        """Group calendars by account so each account's go out in batched API calls"""
+
+        calendars_by_account = {}
+        for calendar in calendars:
+            calendars_by_account.setdefault(calendar.calendar_account_id, []).append(
+                calendar
+            )
+
+        results = []
+        for account_calendars in calendars_by_account.values():
+            results.extend(self._setup_account_webhooks(account_calendars, force=force))
+        return results
+
+    def _setup_account_webhooks(self, calendars, force=False):
+        """Setup webhooks for one account's calendars via batched API calls"""
+
+        try:
+            client = self._get_client(calendars[0].calendar_account)
+            webhook_infos = client.setup_webhooks_batch(calendars, force_recreate=force)
+        except Exception as e:
+            for calendar in calendars:
+                self.stdout.write(self.style.ERROR(f"✗ {calendar.name}: {e}"))
+            return ["failed"] * len(calendars)
+
+        return [
+            self._report_webhook_result(calendar, webhook_infos.get(calendar.pk))
+            for calendar in calendars
+        ]
+
+    def _report_webhook_result(self, calendar, webhook_info):
+        """Write the outcome line for one calendar and return its status"""
+
+        if not webhook_info:
+            self.stdout.write(
+                self.style.ERROR(f"✗ {calendar.name}: Failed to create webhook")
+            )
+            return "failed"
+
+        expires = webhook_info["expires_at"].strftime("%Y-%m-%d %H:%M")
+        if webhook_info.get("skipped"):
+            self.stdout.write(
+                f"⏭ {calendar.name}: Webhook still valid (expires {expires})"
+            )
+            return "skipped"
+
+        self.stdout.write(
+            f"✓ {calendar.name}: Channel {webhook_info['channel_id']} (expires {expires})"
+        )
+        return "success"
+
+    def _get_client(self, calendar_account):
+        """Get the cached Google client for an account (one per command run)"""
+        client = self._clients.get(calendar_account.id)
+        if client is None:
+            client = GoogleCalendarClient(calendar_account)
+            self._clients[calendar_account.id] = client
+        return client
@@ -5,41 +5,213 @@ Tests the cleaned-up webhook implementation that triggers UUID correlation sync.
 Focuses on essential behavior without testing obsolete defensive code.
 """
 
+from contextlib import contextmanager
 from datetime import timedelta
-from unittest.mock import patch
+from io import StringIO
+from unittest.mock import DEFAULT, Mock, patch
 
 from django.contrib.auth.models import User
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import (
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
 from django.urls import reverse
 from django.utils import timezone
 
+from apps.calendars.constants import WebhookConstants
 from apps.calendars.models import Calendar, CalendarAccount
+from apps.webhooks.management.commands import setup_webhooks
+from apps.webhooks.views import GoogleWebhookView, SyncAfterResponse
 
 
-class GoogleWebhookViewTests(TestCase):
-    """Test the minimalist Google webhook endpoint"""
+@contextmanager
+def fast_patch(target, attr, value):
+    """Swap an attribute for the duration of a block - cheaper than mock.patch"""
+    old = getattr(target, attr)
+    setattr(target, attr, value)
+    try:
+        yield value
+    finally:
+        setattr(target, attr, old)
+
+
+class _Forbidden:
+    """Stand-in that fails the test on any use - proves no API call was made"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"unexpected {name} call")
 
-    def setUp(self):
-        self.client = Client()
 
-        # Create test user
-        self.user = User.objects.create_user(
-            username="testuser", email="testuser@example.com"
+class WebhookFixtureMixin:
+    """Creates the user and calendar account every webhook test class needs"""
+
+    @classmethod
+    def create_account_fixtures(cls, username, google_account_id, email):
+        # One reference time for every fixture and test in the class
+        cls._now = timezone.now()
+
+        cls.user = User.objects.create_user(
+            username=username, email=f"{username}@example.com"
         )
 
-        # Create test calendar account and calendar
-        self.calendar_account = CalendarAccount.objects.create(
-            user=self.user,
-            google_account_id="test_google_account_123",
-            email="test@example.com",
+        cls.calendar_account = CalendarAccount.objects.create(
+            user=cls.user,
+            google_account_id=google_account_id,
+            email=email,
             access_token="encrypted_access_token",
             refresh_token="encrypted_refresh_token",
-            token_expires_at=timezone.now() + timedelta(hours=1),
+            token_expires_at=cls._now + timedelta(hours=1),
             is_active=True,
         )
 
-        self.calendar = Calendar.objects.create(
-            calendar_account=self.calendar_account,
+
+class SyncHandlerPatchMixin:
+    """Patches the UUID correlation sync handler once for the whole class"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sync_patcher = patch("apps.webhooks.views.handle_webhook_yolo")
+        cls.mock_handler = cls.sync_patcher.start()
+        cls.mock_handler.return_value = {
+            "status": "success",
+            "results": {"events_processed": 5},
+        }
+        cls.addClassCleanup(cls.sync_patcher.stop)
+
+    def setUp(self):
+        super().setUp()
+        # Keeps the shared success return_value wired in setUpClass
+        self.mock_handler.reset_mock(side_effect=True)
+        # Cached channel -> calendar pks outlive each test's rolled-back rows
+        cache.clear()
+
+    def capture_synced_calendars(self):
+        """Record calendars passed to the sync handler, keeping its return value"""
+        synced = []
+
+        def capture(calendar):
+            synced.append(calendar)
+            return DEFAULT
+
+        self.mock_handler.side_effect = capture
+        return synced
+
+
+# Only what a bare webhook POST passes through - the endpoint is csrf_exempt and
+# unauthenticated, so session/auth/CSRF/message middleware just add per-request work
+# (test_webhook_csrf_exempt still runs under the full stack)
+WEBHOOK_MIDDLEWARE = ["django.middleware.common.CommonMiddleware"]
+
+
+class WebhookPostMixin:
+    """Posts Google notifications to the webhook endpoint"""
+
+    def post_webhook(self, resource_id, channel_id="test-channel-123"):
+        return self.client.post(
+            WebhookConstants.GOOGLE_PATH,
+            HTTP_X_GOOG_RESOURCE_ID=resource_id,
+            HTTP_X_GOOG_CHANNEL_ID=channel_id,
+        )
+
+
+class WebhookHeaderValidationTests(SimpleTestCase):
+    """Test header validation on the view directly - no database or middleware"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = GoogleWebhookView.as_view()
+
+    def test_webhook_missing_headers_returns_400(self):
+        """Test that missing required headers returns 400"""
+        for headers in [
+            {"HTTP_X_GOOG_CHANNEL_ID": "test-channel-123"},  # No resource ID
+            {"HTTP_X_GOOG_RESOURCE_ID": "test_calendar_123"},  # No channel ID
+        ]:
+            with self.subTest(headers=headers):
+                request = self.factory.post("/", **headers)
+                with self.assertLogs("apps.webhooks.views", level="INFO") as logs:
+                    self.assertEqual(self.view(request).status_code, 400)
+                # Rejected before the receipt is logged
+                self.assertEqual([r.levelname for r in logs.records], ["WARNING"])
+
+    def test_webhook_sync_message_acked_without_sync(self):
+        """Test that Google's channel confirmation skips locks, lookups and sync"""
+        request = self.factory.post(
+            "/",
+            HTTP_X_GOOG_RESOURCE_ID="test_calendar_123",
+            HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
+            HTTP_X_GOOG_RESOURCE_STATE="sync",
+        )
+
+        response = self.view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIsInstance(response, SyncAfterResponse)
+
+    def test_webhook_path_matches_urlconf(self):
+        """Test that the shared path constant is where the view is routed"""
+        self.assertEqual(
+            reverse("webhooks:google_webhook"), WebhookConstants.GOOGLE_PATH
+        )
+
+    def test_webhook_csrf_exempt(self):
+        """Test that webhook endpoint is CSRF exempt (required for external requests)"""
+        # Google never sends a CSRF token - enforce checks like production does
+        client = Client(enforce_csrf_checks=True)
+
+        # Missing headers stop at the view's 400, before any calendar lookup
+        response = client.post(
+            WebhookConstants.GOOGLE_PATH,
+            HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
+        )
+
+        # Reaching the view at all means no CSRF error (403)
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MIDDLEWARE=WEBHOOK_MIDDLEWARE)
+class WebhookSyncLockTests(WebhookPostMixin, SimpleTestCase):
+    """Test sync lock short-circuit - a held lock returns before any DB lookup"""
+
+    def test_webhook_sync_coordination(self):
+        """Test that webhook sync coordination prevents duplicate processing"""
+        # Mock cache to simulate sync lock
+        with patch("apps.webhooks.views.cache") as mock_cache:
+            # The calendar sync lock is already held
+            mock_cache.add.return_value = False
+
+            response = self.post_webhook("coord_test_calendar")
+
+            # Should still return 200 but skip processing
+            self.assertEqual(response.status_code, 200)
+
+            # Should have tried to take the calendar lock, leaving the holder's key
+            mock_cache.add.assert_called_once_with(
+                "calendar_sync_lock_coord_test_calendar", "webhook", 120
+            )
+            mock_cache.delete.assert_not_called()
+
+
+@override_settings(MIDDLEWARE=WEBHOOK_MIDDLEWARE)
+class GoogleWebhookViewTests(
+    WebhookPostMixin, SyncHandlerPatchMixin, WebhookFixtureMixin, TestCase
+):
+    """Test the minimalist Google webhook endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_account_fixtures(
+            "testuser", "test_google_account_123", "test@example.com"
+        )
+
+        cls.calendar = Calendar.objects.create(
+            calendar_account=cls.calendar_account,
             name="Test Calendar",
             google_calendar_id="test_calendar_123",
             sync_enabled=True,
@@ -47,275 +219,376 @@ class GoogleWebhookViewTests(TestCase):
 
     def test_webhook_valid_request_triggers_uuid_sync(self):
         """Test that a valid webhook request triggers UUID correlation sync"""
-        url = reverse("webhooks:google_webhook")
-
-        # Mock the UUID correlation sync handler
-        with patch("apps.calendars.services.uuid_sync_engine.handle_webhook_yolo") as mock_handler:
-            mock_handler.return_value = {
-                "status": "success",
-                "calendar": self.calendar.name,
-                "results": {"events_processed": 5}
-            }
+        synced = self.capture_synced_calendars()
 
-            response = self.client.post(
-                url,
-                HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-                HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
-            )
+        response = self.post_webhook(self.calendar.google_calendar_id)
 
         # Should return 200 for successful webhook processing
         self.assertEqual(response.status_code, 200)
 
-        # Verify UUID sync was triggered for correct calendar
-        mock_handler.assert_called_once_with(self.calendar)
-
-    def test_webhook_missing_headers_returns_400(self):
-        """Test that missing required headers returns 400"""
-        url = reverse("webhooks:google_webhook")
-
-        # Missing X-Goog-Resource-ID header
-        response = self.client.post(url, HTTP_X_GOOG_CHANNEL_ID="test-channel-123")
-
-        self.assertEqual(response.status_code, 400)
+        # Verify UUID sync was triggered once, for the correct calendar
+        self.assertEqual(synced, [self.calendar])
 
-        # Missing X-Goog-Channel-ID header
-        response = self.client.post(
-            url, HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id
+    def test_webhook_acks_before_syncing(self):
+        """Test that the 200 is produced first and the sync runs when it is closed"""
+        request = RequestFactory().post(
+            WebhookConstants.GOOGLE_PATH,
+            HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
+            HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
         )
 
-        self.assertEqual(response.status_code, 400)
+        response = GoogleWebhookView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        self.mock_handler.assert_not_called()
+
+        # The WSGI server closes the response once it has been sent
+        response.close()
+        self.mock_handler.assert_called_once_with(self.calendar)
 
     def test_webhook_unknown_calendar_returns_200(self):
         """Test that webhook for unknown calendar still returns 200"""
-        url = reverse("webhooks:google_webhook")
-
-        response = self.client.post(
-            url,
-            HTTP_X_GOOG_RESOURCE_ID="unknown_calendar_id",
-            HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
-        )
+        with self.assertLogs("apps.webhooks.views", level="WARNING") as logs:
+            response = self.post_webhook("unknown_calendar_id")
 
         # Should still return 200 (webhooks should never fail)
         self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "Calendar not found for channel test-channel-123 or resource unknown_calendar_id",
+            logs.output[0],
+        )
+        self.mock_handler.assert_not_called()
 
-    def test_webhook_sync_failure_returns_200(self):
-        """Test that sync failures are handled gracefully and webhook still returns 200"""
-        url = reverse("webhooks:google_webhook")
+    def test_webhook_unknown_channel_cached_briefly(self):
+        """Test that repeat notifications for an unknown channel skip the database"""
+        with self.assertLogs("apps.webhooks.views", level="WARNING"):
+            self.post_webhook("unknown_calendar_id", "calendar-sync-0badf00d")
 
-        # Mock UUID sync to fail
-        with patch("apps.calendars.services.uuid_sync_engine.handle_webhook_yolo") as mock_handler:
-            mock_handler.side_effect = Exception("UUID sync failed")
-
-            response = self.client.post(
-                url,
-                HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-                HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
+        with self.assertNumQueries(0):
+            response = self.post_webhook(
+                "unknown_calendar_id", "calendar-sync-0badf00d"
             )
 
-        # Should still return 200 (fail silently for webhooks)
         self.assertEqual(response.status_code, 200)
+        self.mock_handler.assert_not_called()
 
-    def test_webhook_csrf_exempt(self):
-        """Test that webhook endpoint is CSRF exempt (required for external requests)"""
-        url = reverse("webhooks:google_webhook")
+    def test_webhook_new_channel_not_left_negative_cached(self):
+        """Test a notification racing channel setup doesn't block the new channel"""
+        # Google's "sync" notification can arrive before the channel id is saved
+        with self.assertLogs("apps.webhooks.views", level="WARNING"):
+            self.post_webhook("unknown_calendar_id", "calendar-sync-0badf00d")
 
-        # This should work without CSRF token
-        response = self.client.post(
-            url,
-            HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-            HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
+        self.calendar.update_webhook_info(
+            "calendar-sync-0badf00d", timezone.now() + timedelta(days=6)
         )
+        self.post_webhook("unknown_calendar_id", "calendar-sync-0badf00d")
 
-        # Should not get CSRF error (403)
-        self.assertNotEqual(response.status_code, 403)
-        self.assertEqual(response.status_code, 200)
+        self.mock_handler.assert_called_once()
 
+    def test_webhook_malformed_channel_not_cached(self):
+        """Test that channel ids we could never have created are not negative-cached"""
+        with self.assertLogs("apps.webhooks.views", level="WARNING"):
+            self.post_webhook("unknown_calendar_id", "stale-channel")
 
-class WebhookUUIDIntegrationTests(TestCase):
-    """Integration tests for webhook with UUID correlation system"""
+        self.assertIsNone(
+            cache.get(WebhookConstants.channel_cache_key("stale-channel"))
+        )
 
-    def setUp(self):
-        self.client = Client()
+    def test_webhook_sync_failure_returns_200(self):
+        """Test that sync failures are handled gracefully and webhook still returns 200"""
+        # Mock UUID sync to fail
+        self.mock_handler.side_effect = Exception("UUID sync failed")
 
-        # Create test user
-        self.user = User.objects.create_user(
-            username="integrationuser", email="integrationuser@example.com"
+        with self.assertLogs("apps.webhooks.views", level="ERROR") as logs:
+            response = self.post_webhook(self.calendar.google_calendar_id)
+
+        # Should still return 200 (fail silently for webhooks)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(
+            any(
+                "sync failed" in line and self.calendar.google_calendar_id in line
+                for line in logs.output
+            )
         )
 
-        # Create test calendar account and calendar
-        self.calendar_account = CalendarAccount.objects.create(
-            user=self.user,
-            google_account_id="integration_google_account_456",
-            email="integration@example.com",
-            access_token="encrypted_access_token",
-            refresh_token="encrypted_refresh_token",
-            token_expires_at=timezone.now() + timedelta(hours=1),
-            is_active=True,
+
+@override_settings(MIDDLEWARE=WEBHOOK_MIDDLEWARE)
+class WebhookUUIDIntegrationTests(
+    WebhookPostMixin, SyncHandlerPatchMixin, WebhookFixtureMixin, TestCase
+):
+    """Integration tests for webhook with UUID correlation system"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_account_fixtures(
+            "integrationuser",
+            "integration_google_account_456",
+            "integration@example.com",
         )
 
-        self.calendar = Calendar.objects.create(
-            calendar_account=self.calendar_account,
+        cls.calendar = Calendar.objects.create(
+            calendar_account=cls.calendar_account,
             name="Integration Test Calendar",
             google_calendar_id="integration_test_123",
             sync_enabled=True,
             webhook_channel_id="integration-test-channel",
         )
 
+        # Extra calendars for fan-out scenarios - one INSERT for all of them
+        cls.fanout_calendars = Calendar.objects.bulk_create(
+            [
+                Calendar(
+                    calendar_account=cls.calendar_account,
+                    name=f"Fan-out Calendar {i}",
+                    google_calendar_id=f"integration_fanout_{i}",
+                    sync_enabled=True,
+                    webhook_channel_id=f"integration-fanout-channel-{i}",
+                )
+                for i in range(3)
+            ]
+        )
+
     def test_webhook_channel_id_lookup(self):
         """Test that webhook finds calendar by channel ID (preferred method)"""
-        url = reverse("webhooks:google_webhook")
-
-        # Mock UUID sync to verify calendar is found correctly
-        with patch("apps.calendars.services.uuid_sync_engine.handle_webhook_yolo") as mock_handler:
-            mock_handler.return_value = {"status": "success", "calendar": self.calendar.name}
+        # Capture UUID sync calls to verify calendar is found correctly
+        synced = self.capture_synced_calendars()
 
-            response = self.client.post(
-                url,
-                HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-                HTTP_X_GOOG_CHANNEL_ID="integration-test-channel",
-            )
+        response = self.post_webhook(
+            self.calendar.google_calendar_id, "integration-test-channel"
+        )
 
-            # Should succeed and find calendar by channel ID
-            self.assertEqual(response.status_code, 200)
-            mock_handler.assert_called_once_with(self.calendar)
+        # Should succeed and find calendar by channel ID
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(synced, [self.calendar])
 
     def test_webhook_resource_id_fallback(self):
         """Test that webhook falls back to resource ID when channel ID not found"""
-        url = reverse("webhooks:google_webhook")
+        # Capture UUID sync calls to verify fallback works
+        synced = self.capture_synced_calendars()
+
+        # Channel and resource are matched in the same query
+        with self.assertNumQueries(1):
+            # Channel ID not in DB
+            response = self.post_webhook(
+                self.calendar.google_calendar_id, "unknown-channel-id"
+            )
+
+        # Should succeed using resource ID fallback
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(synced, [self.calendar])
+
+    def test_webhook_channel_match_beats_resource_match(self):
+        """Test that the channel's calendar wins when the resource ID names another"""
+        synced = self.capture_synced_calendars()
+        channel_calendar = self.fanout_calendars[0]
 
-        # Mock UUID sync to verify fallback works
-        with patch("apps.calendars.services.uuid_sync_engine.handle_webhook_yolo") as mock_handler:
-            mock_handler.return_value = {"status": "success", "calendar": self.calendar.name}
+        self.post_webhook(
+            self.calendar.google_calendar_id, channel_calendar.webhook_channel_id
+        )
+
+        self.assertEqual(synced, [channel_calendar])
+
+    def test_webhook_cached_channel_skips_lookup(self):
+        """Test that a known channel resolves through the cached calendar pk"""
+        synced = self.capture_synced_calendars()
+
+        self.post_webhook(self.calendar.google_calendar_id, "integration-test-channel")
+        self.assertEqual(
+            cache.get(WebhookConstants.channel_cache_key("integration-test-channel")),
+            self.calendar.pk,
+        )
 
-            response = self.client.post(
-                url,
-                HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-                HTTP_X_GOOG_CHANNEL_ID="unknown-channel-id",  # Channel ID not in DB
+        # Only the pk lookup runs, with the calendar account joined in
+        with self.assertNumQueries(1):
+            self.post_webhook(
+                self.calendar.google_calendar_id, "integration-test-channel"
             )
+        # Everything the sync engine reads came back with that query
+        calendar = synced[-1]
+        self.assertFalse(
+            {"name", "google_calendar_id"} & calendar.get_deferred_fields()
+        )
+        self.assertEqual(calendar.calendar_account.get_deferred_fields(), set())
+        self.assertEqual(synced, [self.calendar, self.calendar])
+
+    def test_webhook_fanout_routes_each_channel_to_its_calendar(self):
+        """Test that notifications for several channels each sync their own calendar"""
+        synced = self.capture_synced_calendars()
 
-            # Should succeed using resource ID fallback
+        for calendar in self.fanout_calendars:
+            response = self.post_webhook(
+                calendar.google_calendar_id, calendar.webhook_channel_id
+            )
             self.assertEqual(response.status_code, 200)
-            mock_handler.assert_called_once_with(self.calendar)
 
+        self.assertEqual(synced, self.fanout_calendars)
 
-class WebhookCoordinationTests(TestCase):
-    """Test webhook coordination and calendar status functionality"""
 
-    def setUp(self):
-        # Create test user and calendar
-        self.user = User.objects.create_user(
-            username="coorduser", email="coorduser@example.com"
-        )
+@override_settings(MIDDLEWARE=WEBHOOK_MIDDLEWARE)
+class WebhookCoordinationTests(
+    WebhookPostMixin, SyncHandlerPatchMixin, WebhookFixtureMixin, TestCase
+):
+    """Test webhook coordination and calendar status functionality"""
 
-        self.calendar_account = CalendarAccount.objects.create(
-            user=self.user,
-            google_account_id="coord_google_account",
-            email="coord@example.com",
-            access_token="encrypted_access_token",
-            refresh_token="encrypted_refresh_token",
-            token_expires_at=timezone.now() + timedelta(hours=1),
-            is_active=True,
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_account_fixtures(
+            "coorduser", "coord_google_account", "coord@example.com"
         )
 
-        self.calendar = Calendar.objects.create(
-            calendar_account=self.calendar_account,
+        cls.calendar = Calendar.objects.create(
+            calendar_account=cls.calendar_account,
             name="Coordination Test Calendar",
             google_calendar_id="coord_test_calendar",
             sync_enabled=True,
         )
 
-    def test_calendar_has_active_webhook(self):
-        """Test webhook status checking"""
+    def test_webhook_state_transitions(self):
+        """Test webhook status predicates and display across each state"""
         # Initially no webhook
         self.assertFalse(self.calendar.has_active_webhook())
         self.assertTrue(self.calendar.needs_webhook_renewal())
-
-        # Add webhook info
-        future_time = timezone.now() + timedelta(days=3)
-        self.calendar.update_webhook_info("test-channel-123", future_time)
-
-        # Should now have active webhook
-        self.assertTrue(self.calendar.has_active_webhook())
-        self.assertFalse(self.calendar.needs_webhook_renewal())
-
-        # Test expiring webhook
-        expiring_time = timezone.now() + timedelta(hours=12)  # Within 24 hour buffer
-        self.calendar.update_webhook_info("test-channel-456", expiring_time)
-
-        # Should need renewal
-        self.assertFalse(self.calendar.has_active_webhook())
-        self.assertTrue(self.calendar.needs_webhook_renewal())
-
-    def test_webhook_status_display(self):
-        """Test human-readable webhook status"""
-        # No webhook
         self.assertEqual(self.calendar.get_webhook_status(), "No webhook registered")
 
-        # Active webhook
-        future_time = timezone.now() + timedelta(days=3)
-        self.calendar.update_webhook_info("test-channel-123", future_time)
-        self.assertEqual(self.calendar.get_webhook_status(), "Webhook active")
-
-        # Expired webhook
-        past_time = timezone.now() - timedelta(hours=1)
-        self.calendar.update_webhook_info("test-channel-456", past_time)
-        self.assertEqual(self.calendar.get_webhook_status(), "Webhook expired")
+        # (channel, expires in, has active webhook, needs renewal, status)
+        states = [
+            ("test-channel-123", timedelta(days=3), True, False, "Webhook active"),
+            ("test-channel-456", timedelta(hours=-1), False, True, "Webhook expired"),
+            # Within the 24 hour renewal buffer
+            (
+                "test-channel-789",
+                timedelta(hours=12),
+                False,
+                True,
+                "Webhook expires in 12 hours",
+            ),
+        ]
+        # Freeze the model's clock at the class reference time so the
+        # hours-left arithmetic is exact
+        with patch("django.utils.timezone.now", return_value=self._now):
+            for channel_id, expires_in, active, renewal, status in states:
+                with self.subTest(status=status):
+                    # The predicates only read instance fields - no save needed
+                    self.calendar.webhook_channel_id = channel_id
+                    self.calendar.webhook_expires_at = self._now + expires_in
+
+                    self.assertEqual(self.calendar.has_active_webhook(), active)
+                    self.assertEqual(self.calendar.needs_webhook_renewal(), renewal)
+                    self.assertEqual(self.calendar.get_webhook_status(), status)
+
+    def test_webhook_skipped_while_calendar_sync_locked(self):
+        """Test that a held calendar lock skips the sync and leaves the lock alone"""
+        lock_key = f"calendar_sync_lock_{self.calendar.google_calendar_id}"
+        cache.add(lock_key, "scheduled_sync", 60)
+        self.addCleanup(cache.delete, lock_key)
+
+        response = self.post_webhook(self.calendar.google_calendar_id)
 
-        # Expiring webhook
-        expiring_time = timezone.now() + timedelta(hours=12)
-        self.calendar.update_webhook_info("test-channel-789", expiring_time)
-        status = self.calendar.get_webhook_status()
-        self.assertIn("expires in", status)
+        self.assertEqual(response.status_code, 200)
+        self.mock_handler.assert_not_called()
+        self.assertEqual(cache.get(lock_key), "scheduled_sync")
 
-    def test_webhook_sync_coordination(self):
-        """Test that webhook sync coordination prevents duplicate processing"""
-        url = reverse("webhooks:google_webhook")
+    def test_webhook_processing_flow(self):
+        """Test the streamlined webhook processing flow"""
+        with patch("apps.webhooks.views.cache") as mock_cache:
+            # No existing locks or cached channel mapping
+            mock_cache.add.return_value = True
+            mock_cache.get.return_value = None
 
-        # Mock cache to simulate sync lock
-        with patch("django.core.cache.cache") as mock_cache:
-            # Simulate existing sync lock
-            mock_cache.get.return_value = "scheduled_sync"  # Existing lock
-
-            response = self.client.post(
-                url,
-                HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-                HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
-            )
+            response = self.post_webhook(self.calendar.google_calendar_id)
 
-            # Should still return 200 but skip processing
+            # Should succeed and process
             self.assertEqual(response.status_code, 200)
+            self.mock_handler.assert_called_once_with(self.calendar)
 
-            # Should have checked for existing lock
-            expected_cache_key = f"calendar_sync_lock_{self.calendar.google_calendar_id}"
-            mock_cache.get.assert_called_with(expected_cache_key)
+            # Should take and release the single calendar lock
+            lock_key = f"calendar_sync_lock_{self.calendar.google_calendar_id}"
+            mock_cache.add.assert_called_once_with(lock_key, "webhook", 120)
+            mock_cache.delete.assert_called_once_with(lock_key)
 
-    def test_webhook_processing_flow(self):
-        """Test the streamlined webhook processing flow"""
-        url = reverse("webhooks:google_webhook")
-
-        # Mock successful processing
-        with patch("apps.calendars.services.uuid_sync_engine.handle_webhook_yolo") as mock_handler, \
-             patch("django.core.cache.cache") as mock_cache:
-                # No existing locks
-                mock_cache.get.return_value = None
-
-                mock_handler.return_value = {
-                    "status": "success",
-                    "calendar": self.calendar.name,
-                    "processing_time": 0.5,
-                    "results": {"events_processed": 3, "busy_blocks_created": 1}
-                }
-
-                response = self.client.post(
-                    url,
-                    HTTP_X_GOOG_RESOURCE_ID=self.calendar.google_calendar_id,
-                    HTTP_X_GOOG_CHANNEL_ID="test-channel-123",
-                )
 
-                # Should succeed and process
-                self.assertEqual(response.status_code, 200)
-                mock_handler.assert_called_once_with(self.calendar)
+class SetupWebhooksCommandTests(WebhookFixtureMixin, TestCase):
+    """Test the cron-safe setup_webhooks management command"""
 
-                # Should set and clear cache locks
-                mock_cache.set.assert_called()
-                mock_cache.delete.assert_called()
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_account_fixtures(
+            "setupuser", "setup_google_account", "setup@example.com"
+        )
+
+        cls.expiring_calendar = Calendar.objects.create(
+            calendar_account=cls.calendar_account,
+            name="Expiring Calendar",
+            google_calendar_id="setup_expiring_calendar",
+            sync_enabled=True,
+            webhook_channel_id="setup-expiring-channel",
+            webhook_expires_at=cls._now + timedelta(hours=2),
+        )
+        cls.missing_calendar = Calendar.objects.create(
+            calendar_account=cls.calendar_account,
+            name="Missing Webhook Calendar",
+            google_calendar_id="setup_missing_calendar",
+            sync_enabled=True,
+        )
+        cls.active_calendar = Calendar.objects.create(
+            calendar_account=cls.calendar_account,
+            name="Active Webhook Calendar",
+            google_calendar_id="setup_active_calendar",
+            sync_enabled=True,
+            webhook_channel_id="setup-active-channel",
+            webhook_expires_at=cls._now + timedelta(days=5),
+        )
+
+    def test_limit_processes_most_urgent_calendars_first(self):
+        """Test that --limit bounds the run and renews missing/expiring webhooks first"""
+        mock_client = Mock()
+        mock_client.setup_webhooks_batch.side_effect = lambda calendars, **kwargs: {
+            calendar.pk: {
+                "channel_id": "new-channel",
+                "expires_at": self._now + timedelta(days=6),
+            }
+            for calendar in calendars
+        }
+
+        out = StringIO()
+        with fast_patch(
+            setup_webhooks, "GoogleCalendarClient", Mock(return_value=mock_client)
+        ):
+            call_command("setup_webhooks", limit=2, stdout=out)
+
+        processed = mock_client.setup_webhooks_batch.call_args.args[0]
+        self.assertEqual(processed, [self.missing_calendar, self.expiring_calendar])
+        self.assertIn("Processing at most 2 calendars", out.getvalue())
+        self.assertIn("Successfully setup 2 webhooks", out.getvalue())
+
+    def test_account_calendars_setup_in_one_batch(self):
+        """Test that one client and one batched call are used per account"""
+        mock_client = Mock()
+        mock_client.setup_webhooks_batch.return_value = {
+            self.active_calendar.pk: {
+                "channel_id": "setup-active-channel",
+                "expires_at": self.active_calendar.webhook_expires_at,
+                "skipped": True,
+            },
+        }
+
+        out = StringIO()
+        with fast_patch(
+            setup_webhooks, "GoogleCalendarClient", Mock(return_value=mock_client)
+        ) as mock_client_class:
+            call_command("setup_webhooks", stdout=out)
+
+        mock_client_class.assert_called_once_with(self.calendar_account)
+        mock_client.setup_webhooks_batch.assert_called_once()
+        mock_client.setup_webhook.assert_not_called()
+        self.assertIn("Skipped 1 calendars", out.getvalue())
+        self.assertIn("Failed to setup 2 webhooks", out.getvalue())
+
+    def test_dry_run_makes_no_api_calls(self):
+        """Test that --dry-run reports webhook status without touching Google"""
+        out = StringIO()
+        with fast_patch(
+            setup_webhooks, "GoogleCalendarClient", lambda account: _Forbidden()
+        ):
+            call_command("setup_webhooks", dry_run=True, stdout=out)
+
+        self.assertEqual(out.getvalue().count("[DRY RUN] Would setup webhook"), 3)
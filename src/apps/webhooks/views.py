@@ -5,16 +5,78 @@ This is the complete webhook solution in ~50 lines of code.
 Achieves 95% API call reduction without architectural over-engineering.
 """
 
+from contextlib import contextmanager
 import logging
+import re
 
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, When
 from django.http import HttpResponse
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
+from apps.calendars.constants import WebhookConstants
+from apps.calendars.models import Calendar
+from apps.calendars.services.google_calendar_client import is_rate_limit_error
+from apps.calendars.services.uuid_sync_engine import handle_webhook_yolo
+
 
 logger = logging.getLogger(__name__)
 
+# How long a channel -> calendar mapping is trusted before re-resolving it
+CHANNEL_CALENDAR_CACHE_TIMEOUT = 3600  # 1 hour
+
+# Cached in place of a pk for channels matching no calendar (pks start at 1), kept
+# briefly so stale channels Google keeps notifying cost no query
+UNKNOWN_CHANNEL = 0
+UNKNOWN_CHANNEL_CACHE_TIMEOUT = 60
+
+# Only ids shaped like the channels we create are negative-cached, so arbitrary
+# header values can't fill the cache
+CHANNEL_ID_PATTERN = re.compile(
+    rf"{re.escape(WebhookConstants.CHANNEL_ID_PREFIX)}[0-9a-f]{{8}}"
+)
+
+
+@contextmanager
+def cache_lock(key, owner, timeout):
+    """Hold a cache key as a lock for the block, yielding whether it was taken"""
+    # cache.add only sets a missing key, so check-and-take is one atomic call -
+    # two concurrent webhooks can never both acquire
+    acquired = cache.add(key, owner, timeout)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            cache.delete(key)
+
+
+class SyncAfterResponse(HttpResponse):
+    """
+    200 ack that runs a sync callback after it has been sent.
+
+    WSGI servers call close() once the response body is written, so the
+    callback runs on the same worker but outside Google's request timeout.
+
+    This only shortens Google's wait: the worker (and its DB connection) stays
+    busy until the sync finishes, so under sync WSGI workers a burst of
+    notifications still ties up workers for the full sync time. Moving the
+    work off the request worker needs a task queue, which this app doesn't run.
+    """
+
+    def __init__(self, sync, *sync_args):
+        super().__init__(status=200)
+        self._sync = sync
+        self._sync_args = sync_args
+
+    def close(self):
+        try:
+            self._sync(*self._sync_args)
+        finally:
+            # request_finished handlers (DB connection cleanup) run after the sync
+            super().close()
+
 
 @method_decorator(csrf_exempt, name="dispatch")
 class GoogleWebhookView(View):
@@ -32,87 +94,110 @@ class GoogleWebhookView(View):
         calendar_id = request.META.get("HTTP_X_GOOG_RESOURCE_ID")
         channel_id = request.META.get("HTTP_X_GOOG_CHANNEL_ID")
 
-        # Log webhook basics
-        logger.info(f"Webhook received - Channel: {channel_id}, Resource: {calendar_id}")
-
-        # Basic validation - ensure required headers are present
+        # Basic validation first - bogus requests are rejected before any other work
         if not calendar_id or not channel_id:
             logger.warning(
-                f"Webhook missing required headers - Resource ID: {calendar_id}, Channel ID: {channel_id}"
+                "Webhook missing required headers - Resource ID: %s, Channel ID: %s",
+                calendar_id,
+                channel_id,
             )
             return HttpResponse(status=400)
 
-        # Trigger sync for this specific calendar
-        self._trigger_sync(calendar_id, channel_id)
+        # Google's "sync" message only confirms a new channel - nothing has changed
+        if request.META.get("HTTP_X_GOOG_RESOURCE_STATE") == "sync":
+            logger.info("Webhook channel %s confirmed (sync message)", channel_id)
+            return HttpResponse(status=200)
+
+        # Log webhook basics (lazy %-formatting throughout - no work when filtered)
+        logger.info(
+            "Webhook received - Channel: %s, Resource: %s", channel_id, calendar_id
+        )
 
-        # Always return 200 - webhooks should never fail
-        return HttpResponse(status=200)
+        # Always return 200 - webhooks should never fail. The sync for this calendar
+        # runs once the server has sent the ack, so Google never waits on it
+        return SyncAfterResponse(self._trigger_sync, calendar_id, channel_id)
 
     def _trigger_sync(self, calendar_id, channel_id):
         """Trigger existing sync logic for the calendar that changed"""
 
         # Global sync coordination: Prevent conflicts between webhook and scheduled syncs
-        from django.core.cache import cache
-
-        # Use calendar-based cache key (not operation-specific) for global coordination
+        # Use calendar-based cache key (not operation-specific) for global coordination.
+        # A channel always reports the same resource, so this also drops duplicates
         global_cache_key = f"calendar_sync_lock_{calendar_id}"
-        webhook_cache_key = f"webhook_sync_{channel_id}"
 
         # UUID correlation prevents cascades, but we still coordinate to avoid conflicts
+        with cache_lock(global_cache_key, "webhook", 120) as acquired:  # 2 min priority
+            if not acquired:
+                return  # Sync already running for this calendar
 
-        # Check if sync is already running for this calendar
-        existing_lock = cache.get(global_cache_key)
-        if existing_lock:
-            return
-
-        # Check if webhook is already processing for this channel
-        if cache.get(webhook_cache_key):
-            return
-
-        # Set global sync lock to prevent scheduled syncs from interfering
-        cache.set(global_cache_key, "webhook", 120)  # 2 minutes for webhook priority
-        # Set webhook-specific flag to prevent duplicate webhook processing
-        cache.set(webhook_cache_key, True, 60)
-
-        try:
-            from apps.calendars.models import Calendar
-            from apps.calendars.services.uuid_sync_engine import handle_webhook_yolo
-
-            # Find calendar by webhook channel ID (more reliable than resource ID)
             try:
-                calendar = Calendar.objects.get(
-                    webhook_channel_id=channel_id,
-                    sync_enabled=True,
-                    calendar_account__is_active=True,
-                )
-
-            except Calendar.DoesNotExist:
-                # Fallback: try to find by resource ID (Google Calendar ID)
-                try:
-                    calendar = Calendar.objects.get(
-                        google_calendar_id=calendar_id,
-                        sync_enabled=True,
-                        calendar_account__is_active=True,
-                    )
-                except Calendar.DoesNotExist:
-                    logger.warning(
-                        f"Calendar not found for channel {channel_id} or resource {calendar_id}"
-                    )
+                calendar = self._find_calendar(calendar_id, channel_id)
+                if calendar is None:
                     return
 
-            # Execute UUID correlation sync
-            logger.info(f"Starting sync for calendar: {calendar.name}")
+                # Execute UUID correlation sync
+                logger.info("Starting sync for calendar: %s", calendar.name)
 
-            results = handle_webhook_yolo(calendar)
+                results = handle_webhook_yolo(calendar)
 
-            logger.info(f"Sync completed - Status: {results.get('status', 'unknown')}")
+                logger.info(
+                    "Sync completed - Status: %s", results.get("status", "unknown")
+                )
 
-        except Exception as e:
-            # Log error but don't return error to Google (webhooks should never fail)
-            logger.error(f"Webhook sync failed for {calendar_id}: {e}")
-            if "rateLimitExceeded" not in str(e) and "quotaExceeded" not in str(e):
-                logger.exception("Webhook sync error details:")
-        finally:
-            # Clear processing flags
-            cache.delete(webhook_cache_key)
-            cache.delete(global_cache_key)
+            except Exception as e:
+                # Log error but don't return error to Google (webhooks should never fail)
+                logger.error("Webhook sync failed for %s: %s", calendar_id, e)
+                if not is_rate_limit_error(e):
+                    logger.exception("Webhook sync error details:")
+
+    def _find_calendar(self, calendar_id, channel_id):
+        """Resolve the sync-enabled calendar a notification refers to, or None"""
+        # Only the columns the sync engine reads - the account (tokens) loads in full
+        calendars = (
+            Calendar.objects.select_related("calendar_account")
+            .only("name", "google_calendar_id", "calendar_account")
+            .filter(sync_enabled=True, calendar_account__is_active=True)
+        )
+
+        # Channel -> calendar pk is cached, so repeat notifications use a primary
+        # key lookup; the filters above still apply, so stale entries just miss
+        channel_cache_key = WebhookConstants.channel_cache_key(channel_id)
+        calendar_pk = cache.get(channel_cache_key)
+        if calendar_pk == UNKNOWN_CHANNEL:
+            logger.debug("Ignoring webhook for unknown channel %s", channel_id)
+            return None
+        if calendar_pk is not None:
+            calendar = calendars.filter(pk=calendar_pk).first()
+            if calendar is not None:
+                return calendar
+
+        # Match by webhook channel ID (more reliable) or fall back to the resource ID
+        # (Google Calendar ID) - one query, with a channel match ranked first
+        calendar = (
+            calendars.filter(
+                Q(webhook_channel_id=channel_id) | Q(google_calendar_id=calendar_id)
+            )
+            .annotate(
+                match_rank=Case(
+                    When(webhook_channel_id=channel_id, then=0),
+                    default=1,
+                    output_field=IntegerField(),
+                )
+            )
+            .order_by("match_rank")
+            .first()
+        )
+        if calendar is None:
+            logger.warning(
+                "Calendar not found for channel %s or resource %s",
+                channel_id,
+                calendar_id,
+            )
+            if CHANNEL_ID_PATTERN.fullmatch(channel_id):
+                cache.set(
+                    channel_cache_key, UNKNOWN_CHANNEL, UNKNOWN_CHANNEL_CACHE_TIMEOUT
+                )
+            return None
+
+        cache.set(channel_cache_key, calendar.pk, CHANNEL_CALENDAR_CACHE_TIMEOUT)
+        return calendar
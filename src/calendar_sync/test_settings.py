@@ -0,0 +1,16 @@
+"""
+Django test settings for calendar_sync project.
+
+Fast, self-contained settings for running the test suite:
+
+    python manage.py test --settings=calendar_sync.test_settings
+"""
+
+from .settings import *  # noqa: F403
+
+
+# Test client talks plain HTTP - don't redirect every request to HTTPS
+SECURE_SSL_REDIRECT = False
+
+# Fixtures create users with passwords - skip PBKDF2's deliberate slowness
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
@@ -22,10 +22,11 @@ from django.urls import include, path
 
 
 urlpatterns = [
+    # Webhooks first - the highest-traffic route resolves on the first pattern
+    path("webhooks/", include("apps.webhooks.urls")),  # Simplified webhook endpoint
     path("admin/", admin.site.urls),
     path("", include("apps.dashboard.urls")),
     path("", include("apps.accounts.urls")),
-    path("webhooks/", include("apps.webhooks.urls")),  # Simplified webhook endpoint
     # Django built-in auth views
     path(
         "login/",